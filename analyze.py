@@ -1,32 +1,140 @@
 import sys
+import time
 import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from tabulate import tabulate
 from src.data_fetcher import get_stock_data
 from src.indicators import calculate_indicators
 from src.checkers.overheating import check_overheating
 from src.checkers.caution import check_caution
 from src.checkers.warning import check_warning
+from src.checkers.history import evaluate_history
 
-def main():
-    parser = argparse.ArgumentParser(description="KRX 종목 지정 요건 검사기")
-    parser.add_argument("code", type=str, help="종목코드 (예: 삼성전자 005930)")
-    parser.add_argument("--date", type=str, help="검사 기준 날짜 (YYYY-MM-DD)", default=None)
-    args = parser.parse_args()
-    
-    print(f"{args.code} 데이터 조회 중...")
-    df = get_stock_data(args.code)
+
+def load_codes(args):
+    """
+    Codes from positional args and/or --file (one per line; CSV 의 첫 번째 열), 중복 제거.
+    """
+    codes = list(args.codes)
+    if args.file:
+        with open(args.file, encoding="utf-8-sig") as f:
+            for line in f:
+                code = line.split(",")[0].strip()
+                if code and code.lower() != "code" and not code.startswith("#"):
+                    codes.append(code)
+    return list(dict.fromkeys(codes))
+
+
+def analyze_frame(code, df):
+    """
+    Indicators + checks for one code (runs in a worker process).
+    """
+    started = time.perf_counter()
+    df = calculate_indicators(df)
+    oh_triggered, _ = check_overheating(df)
+    ca_triggered, _ = check_caution(df)
+    wa_triggered, _ = check_warning(df)
+    return {
+        "code": code,
+        "기준일": df.index[-1].strftime('%Y-%m-%d'),
+        "종가": float(df.iloc[-1]['Close']),
+        "단기과열": "지정예상" if oh_triggered else "",
+        "투자주의": "지정예상" if ca_triggered else "",
+        "투자경고": "지정예상" if wa_triggered else "",
+        "compute_s": time.perf_counter() - started,
+    }
+
+
+def fetch(code, date):
+    started = time.perf_counter()
+    df = get_stock_data(code, end=date)
+    return code, df, time.perf_counter() - started
+
+
+def run_many(codes, date, workers, procs, ordered):
+    """
+    조회(네트워크 대기)는 스레드 풀, 지표 계산과 검사는 프로세스 풀에서 실행합니다.
+    조회가 끝나는 대로 계산을 넘기므로 두 단계가 겹쳐서 진행됩니다.
+    """
+    started = time.perf_counter()
+    rows = {}
+    fetch_times = {}
+    done = 0
+    next_idx = 0
+
+    def emit(row):
+        nonlocal done
+        done += 1
+        if "error" in row:
+            print(f"[{done}/{len(codes)}] {row['code']}: {row['error']}")
+        else:
+            flags = ", ".join(k for k in ("단기과열", "투자주의", "투자경고") if row[k]) or "해당없음"
+            print(f"[{done}/{len(codes)}] {row['code']} {row['기준일']} {row['종가']:,.0f} -> {flags}")
+
+    def finish(row):
+        nonlocal next_idx
+        rows[row["code"]] = row
+        if not ordered:
+            emit(row)
+            return
+        # 입력 순서대로 출력: 앞 종목이 끝날 때까지 대기
+        while next_idx < len(codes) and codes[next_idx] in rows:
+            emit(rows[codes[next_idx]])
+            next_idx += 1
+
+    with ThreadPoolExecutor(max_workers=workers) as threads, ProcessPoolExecutor(max_workers=procs) as processes:
+        pending = set()
+        for code in codes:
+            future = threads.submit(fetch, code, date)
+            future.code = code  # 실패 시 어느 종목인지 알기 위해
+            pending.add(future)
+        # 조회(스레드)와 계산(프로세스) future 를 한 집합에서 기다림
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    finish({"code": future.code, "error": f"실패: {e}"})
+                    continue
+                if isinstance(result, dict):  # analyze_frame 결과
+                    finish(result)
+                    continue
+                code, df, fetch_s = result
+                fetch_times[code] = fetch_s
+                if df is None or df.empty:
+                    finish({"code": code, "error": "데이터 조회 실패"})
+                    continue
+                compute = processes.submit(analyze_frame, code, df)
+                compute.code = code
+                pending.add(compute)
+
+    elapsed = time.perf_counter() - started
+    headers = ["code", "기준일", "종가", "단기과열", "투자주의", "투자경고", "fetch_s", "compute_s", "오류"]
+    table = []
+    for code in codes:
+        row = {**rows[code], "fetch_s": fetch_times.get(code), "오류": rows[code].get("error")}
+        table.append([row.get(h) for h in headers])
+    print("\n" + tabulate(table, headers=headers, tablefmt="simple", floatfmt=",.2f", missingval="-"))
+
+    compute_total = sum(rows[c].get("compute_s", 0) for c in codes)
+    print(f"\n종목 {len(codes)}개 / 전체 {elapsed:.2f}s "
+          f"(조회 합계 {sum(fetch_times.values()):.2f}s, 계산 합계 {compute_total:.2f}s)")
+
+
+def run_single(code, date, history):
+    print(f"{code} 데이터 조회 중...")
+    if date:
+        print(f"기준일자 변경: {date} (이후 데이터 제외)")
+    # 기준일이 주어지면 그 날짜에서 끝나는 구간만 조회
+    df = get_stock_data(code, end=date)
     
     if df is None:
         print("데이터 조회 실패. 종목코드를 확인해주세요.")
         sys.exit(1)
-
-    # If a date is provided, filter the dataframe to include data only up to that date
-    if args.date:
-        print(f"기준일자 변경: {args.date} (이후 데이터 제외)")
-        df = df[df.index <= args.date]
-        if df.empty:
-            print(f"해당 날짜({args.date}) 이전 데이터가 없습니다.")
-            sys.exit(1)
+    if df.empty:
+        print(f"해당 날짜({date}) 이전 데이터가 없습니다.")
+        sys.exit(1)
         
     print("지표 계산 중...")
     df = calculate_indicators(df)
@@ -38,7 +146,7 @@ def main():
     
     # Print Report
     print("\n" + "="*40)
-    print(f" 검사 결과: {args.code}")
+    print(f" 검사 결과: {code}")
     print("="*40)
     
     latest_close = df.iloc[-1]['Close']
@@ -91,5 +199,35 @@ def main():
                 tp_str = f" (대상가: {target_price:,.0f})" if target_price is not None else ""
                 print(f"  - {k}: {val:.2%} >= {thresh:.2%} ? [{status}]{tp_str}")
 
+    if history:
+        print("-" * 40)
+        print("[기간 내 요건 충족일]")
+        history = evaluate_history(df)
+        for col, label in [("overheating", "단기과열종목"), ("caution", "투자주의종목"), ("warning", "투자경고종목")]:
+            dates = history.index[history[col].to_numpy(dtype=bool)]
+            joined = ", ".join(d.strftime('%Y-%m-%d') for d in dates) if len(dates) else "없음"
+            print(f"  - {label}: {joined}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KRX 종목 지정 요건 검사기")
+    parser.add_argument("codes", nargs="*", help="종목코드 (예: 삼성전자 005930). 여러 개 지정 가능")
+    parser.add_argument("--file", type=str, default=None, help="종목코드 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--date", type=str, help="검사 기준 날짜 (YYYY-MM-DD)", default=None)
+    parser.add_argument("--history", action="store_true", help="조회 기간 전체에서 요건을 충족한 날짜 출력 (단일 종목)")
+    parser.add_argument("--workers", type=int, default=8, help="동시 조회 스레드 수 (여러 종목)")
+    parser.add_argument("--procs", type=int, default=None, help="계산 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--as-completed", action="store_true", help="입력 순서 대신 끝나는 순서대로 출력")
+    args = parser.parse_args()
+
+    codes = load_codes(args)
+    if not codes:
+        parser.error("종목코드를 입력하거나 --file 을 지정해주세요.")
+    if len(codes) == 1:
+        run_single(codes[0], args.date, args.history)
+    else:
+        run_many(codes, args.date, args.workers, args.procs, ordered=not args.as_completed)
+
+
 if __name__ == "__main__":
     main()
@@ -1,12 +1,67 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import math
 import os
+from email.utils import formatdate, parsedate_to_datetime
 from typing import Optional
 
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 
-from src.report import generate_stock_report
+from src.market import get_market_snapshot
+from src.providers import get_providers
+from src.release_batch import iter_release_schedules
+from src.report import CachedReport, generate_stock_reports_async, report_cache
+from src.screener import screen, to_records
+from src.snapshot import get_snapshot_store
+from src.stream import StreamHub
+
+
+class StockBatchRequest(BaseModel):
+    codes: list[str] = Field(min_length=1, max_length=100)
+    date: Optional[str] = None
+
+
+class ReleaseItem(BaseModel):
+    code: str
+    designation_date: str
+
+
+class ReleaseBatchRequest(BaseModel):
+    items: list[ReleaseItem]
+    max_workers: int = Field(default=8, ge=1, le=32)
+
+
+def _cache_headers(entry: CachedReport) -> dict[str, str]:
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": formatdate(entry.last_modified, usegmt=True),
+    }
+    if math.isinf(entry.ttl):
+        # 과거 날짜 리포트는 바뀌지 않음
+        headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        # 항상 재검증하되, 변경이 없으면 304 로 본문 없이 응답
+        headers["Cache-Control"] = "no-cache"
+    return headers
+
+
+def _not_modified(request: Request, entry: CachedReport) -> bool:
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        tags = [t.strip() for t in inm.split(",")]
+        return "*" in tags or entry.etag in tags or f"W/{entry.etag}" in tags
+    ims = request.headers.get("if-modified-since")
+    if ims:
+        try:
+            return int(entry.last_modified) <= parsedate_to_datetime(ims).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
 
 
 def create_app() -> FastAPI:
@@ -25,15 +80,96 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "Last-Modified"],
     )
 
+    # 모든 /api/stream 구독자가 공유하는 평가 루프
+    app.state.stream_hub = StreamHub(interval=float(os.getenv("STREAM_INTERVAL", "5")))
+    snapshot = get_snapshot_store() if os.getenv("STOCK_SNAPSHOT", "1") != "0" else None
+    if snapshot is not None and snapshot.path.exists():
+        # 첫 요청 전에 스냅샷을 메모리에 올려 둠 (백그라운드)
+        snapshot.refresh_in_background()
+
     @app.get("/health")
     def health() -> dict:
         return {"ok": True}
 
     @app.get("/api/stock/{code}")
-    def analyze_stock(code: str, date: Optional[str] = Query(default=None)) -> dict:
-        return generate_stock_report(code=code, date=date)
+    async def analyze_stock(request: Request, code: str, date: Optional[str] = Query(default=None)) -> Response:
+        # 기준일 없는 요청은 장 마감 후 만들어 둔 스냅샷에서 먼저 찾음
+        entry = snapshot.lookup(code) if date is None and snapshot is not None else None
+        if entry is None:
+            entry = await report_cache.get_async(code, date)
+        headers = _cache_headers(entry)
+        if _not_modified(request, entry):
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(entry.report, headers=headers)
+
+    @app.post("/api/stocks")
+    async def analyze_stocks(req: StockBatchRequest) -> dict:
+        reports = await generate_stock_reports_async(req.codes, req.date)
+        return {"ok": True, "reports": reports}
+
+    @app.get("/api/stream")
+    async def stream(codes: str = Query(..., description="쉼표로 구분한 종목코드 (최대 50개)")) -> StreamingResponse:
+        """
+        Server-Sent Events: 구독 종목의 상태/대상가 거리 변경분만 `event: update` 로 전송합니다.
+        """
+        code_list = list(dict.fromkeys(c.strip() for c in codes.split(",") if c.strip()))[:50]
+        hub: StreamHub = app.state.stream_hub
+        queue = await hub.subscribe(code_list)
+
+        async def events():
+            try:
+                while True:
+                    try:
+                        message = await asyncio.wait_for(queue.get(), timeout=15)
+                    except asyncio.TimeoutError:
+                        yield ": keep-alive\n\n"
+                        continue
+                    yield f"event: update\ndata: {json.dumps(message, ensure_ascii=False)}\n\n"
+            finally:
+                hub.unsubscribe(code_list, queue)
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.get("/api/cache/stats")
+    def cache_stats() -> dict:
+        stats = {"ok": True, "report": report_cache.stats(), "providers": get_providers().stats()}
+        if snapshot is not None and snapshot.path.exists():
+            stats["snapshot_runs"] = snapshot.runs(limit=3)
+        return stats
+
+    @app.get("/api/market")
+    def market() -> dict:
+        # 거래일 단위로 캐시된 지수 스냅샷 (새 종가가 확정되기 전까지 다시 받지 않음)
+        indices = get_market_snapshot()
+        return {"ok": bool(indices), "indices": indices}
+
+    @app.get("/api/screener")
+    def screener(
+        only_triggered: bool = Query(default=True),
+        limit: int = Query(default=100, ge=1, le=5000),
+    ) -> dict:
+        table = screen(only_triggered=only_triggered)
+        return {"ok": True, "count": int(len(table)), "items": to_records(table.head(limit))}
+
+    @app.post("/api/release/batch")
+    def release_batch(req: ReleaseBatchRequest) -> StreamingResponse:
+        """
+        Streams one JSON line per stock as each schedule finishes (NDJSON).
+        """
+        items = [item.model_dump() for item in req.items]
+
+        def lines():
+            for result in iter_release_schedules(items, max_workers=req.max_workers):
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
 
     return app
 
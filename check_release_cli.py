@@ -1,39 +1,9 @@
-import sys
-import os
-from datetime import datetime
+import argparse
 
-# Add src to path
-sys.path.append(os.path.join(os.getcwd(), 'src'))
+from src.release_batch import iter_release_schedules, load_release_requests, release_schedule_for
 
-from data_fetcher import get_stock_data, get_stock_name
-from checkers.warning_release import get_release_schedule
 
-def main():
-    if len(sys.argv) < 3:
-        print("Usage: python check_release_cli.py <stock_code> <designation_date>")
-        print("Example: python check_release_cli.py 032820 2026-01-22")
-        return
-
-    code = sys.argv[1]
-    designation_date = sys.argv[2]
-    
-    name = get_stock_name(code)
-    print(f"--- [{name or code}] 투자경고 해제 분석 ---")
-    print(f"지정일: {designation_date}")
-    
-    # Fetch 120 days of data to ensure we have T-15
-    df = get_stock_data(code, days=120)
-    
-    if df is None or df.empty:
-        print("데이터를 가져오는데 실패했습니다.")
-        return
-        
-    schedule = get_release_schedule(df, designation_date)
-    
-    if "error" in schedule:
-        print(f"오류 발생: {schedule['error']}")
-        return
-        
+def print_schedule(schedule):
     if schedule['status'] == "released":
         print(f"✅ 해제 완료: {schedule['released_date']}")
     else:
@@ -42,17 +12,70 @@ def main():
     if schedule.get('determination_history'):
         print("\n[최근 판단 내역]")
         for item in schedule['determination_history'][-3:]: # Show last 3
+            if item is None:
+                continue
             status = "통과" if not any(item['fails'].values()) else "불가"
             print(f"- {item['date']}: {item['close']:,.0f}원 (기준: {item['release_ceiling']:,.0f}원 미만) -> {status}")
             if status == "불가":
                 fails = [k for k, v in item['fails'].items() if v]
                 print(f"  * 위반 요건: {', '.join(fails)}")
 
-    if schedule['status'] == "pending" and schedule.get('determination_history'):
-        last = schedule['determination_history'][-1]
+    last = schedule.get('next_thresholds')
+    if schedule['status'] == "pending" and last:
         print(f"\n💡 다음 판단일 해제 요건 (현재가 기준):")
         print(f"  - 종가가 {last['release_ceiling']:,.0f}원 미만이어야 합니다.")
         print(f"  (참고: 5일전 160%={last['thresh_5d']:,.0f}, 15일전 200%={last['thresh_15d']:,.0f}, 15일간 최고가={last['prev_14_max']:,.0f})")
 
+
+def run_single(code, designation_date):
+    # --batch 와 같은 경로 (지정일로부터 필요한 기간만큼 조회)
+    result = release_schedule_for(code, designation_date)
+    print(f"--- [{result.get('name') or code}] 투자경고 해제 분석 ---")
+    print(f"지정일: {designation_date}")
+
+    if "error" in result:
+        print(f"오류 발생: {result['error']}")
+        return
+
+    print_schedule(result["schedule"])
+
+
+def run_batch(path, workers):
+    items = load_release_requests(path)
+    print(f"{len(items)}개 종목 해제 일정 계산 중... (동시 조회 {workers})")
+    for result in iter_release_schedules(items, max_workers=workers):
+        label = f"[{result.get('name') or result['code']}] ({result['code']}, 지정일 {result['designation_date']})"
+        if "error" in result:
+            print(f"❌ {label}: {result['error']}")
+            continue
+        schedule = result["schedule"]
+        if schedule['status'] == "released":
+            print(f"✅ {label}: 해제 {schedule['released_date']}")
+        elif schedule['status'] == "waiting":
+            print(f"⏳ {label}: {schedule['message']}")
+        else:
+            last = schedule.get('next_thresholds') or {}
+            ceiling = last.get('release_ceiling')
+            ceiling_str = f"{ceiling:,.0f}원 미만" if ceiling is not None else "-"
+            print(f"⏳ {label}: 해제 대기 (다음 판단일 기준 {ceiling_str})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="투자경고종목 해제 일정 계산기")
+    parser.add_argument("code", nargs="?", help="종목코드 (예: 032820)")
+    parser.add_argument("designation_date", nargs="?", help="투자경고 지정일 (YYYY-MM-DD)")
+    parser.add_argument("--batch", metavar="FILE", help="code,designation_date 목록 (CSV 또는 JSON)")
+    parser.add_argument("--workers", type=int, default=8, help="--batch 시 동시 조회 수")
+    args = parser.parse_args()
+
+    if args.batch:
+        run_batch(args.batch, args.workers)
+    elif args.code and args.designation_date:
+        run_single(args.code, args.designation_date)
+    else:
+        print("Usage: python check_release_cli.py <stock_code> <designation_date>")
+        print("       python check_release_cli.py --batch designations.csv [--workers 8]")
+        print("Example: python check_release_cli.py 032820 2026-01-22")
+
 if __name__ == "__main__":
     main()
@@ -1,12 +1,20 @@
 import os
+import json
+import time
+import argparse
 import datetime
+import threading
+from functools import partial
 import requests
-import yfinance as yf
-import google.generativeai as genai
 from bs4 import BeautifulSoup
-import base64
 from dotenv import load_dotenv
 
+from src.llm import GenerationCache, generate_cached, get_llm_client
+from src.market import get_market_snapshot
+from src.pipeline import PostJob, print_summary, run_pipeline
+from src.report import generate_stock_report
+from src.wordpress import WordPressClient, WordPressError
+
 # Load environment variables
 load_dotenv()
 
@@ -20,98 +28,67 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 CATEGORY_US_STOCKS = "미국주식"
 CATEGORY_KR_STOCKS = "한국주식"
 
-def get_wp_headers():
-    credentials = f"{WP_USERNAME}:{WP_APP_PASSWORD}"
-    token = base64.b64encode(credentials.encode()).decode()
-    return {
-        "Authorization": f"Basic {token}",
-        "Content-Type": "application/json"
-    }
+_wp_client = None
+
+def get_wp_client():
+    """Shared WordPress client (one pooled session per run). None if credentials are missing."""
+    global _wp_client
+    if _wp_client is None:
+        _wp_client = WordPressClient.from_env()
+    return _wp_client
 
 def get_or_create_category(category_name):
     """Gets category ID by name, or creates it if it doesn't exist."""
     print(f"Checking category: {category_name}...")
-    headers = get_wp_headers()
-    
-    # 1. Search for category
     try:
-        search_url = f"{WP_URL}/wp-json/wp/v2/categories?search={category_name}"
-        response = requests.get(search_url, headers=headers)
-        response.raise_for_status()
-        categories = response.json()
-        
-        for cat in categories:
-            if cat['name'] == category_name:
-                return cat['id']
-                
-        # 2. Create if not found
-        print(f"Creating category: {category_name}...")
-        create_url = f"{WP_URL}/wp-json/wp/v2/categories"
-        data = {"name": category_name}
-        response = requests.post(create_url, headers=headers, json=data)
-        response.raise_for_status()
-        return response.json()['id']
-        
+        return get_wp_client().get_or_create_category(category_name)
     except Exception as e:
         print(f"Error managing category {category_name}: {e}")
         return None
 
 def get_or_create_tag(tag_name):
     """Gets tag ID by name, or creates it if it doesn't exist."""
-    # Similar logic to categories but for tags
-    headers = get_wp_headers()
     try:
-        search_url = f"{WP_URL}/wp-json/wp/v2/tags?search={tag_name}"
-        response = requests.get(search_url, headers=headers)
-        response.raise_for_status()
-        tags = response.json()
-        
-        for tag in tags:
-            if tag['name'] == tag_name:
-                return tag['id']
-        
-        create_url = f"{WP_URL}/wp-json/wp/v2/tags"
-        data = {"name": tag_name}
-        response = requests.post(create_url, headers=headers, json=data)
-        response.raise_for_status()
-        return response.json()['id']
+        return get_wp_client().get_or_create_tag(tag_name)
     except Exception as e:
         print(f"Error managing tag {tag_name}: {e}")
         return None
 
 
-# Configure Gemini
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+_llm_client = None
+_llm_lock = threading.Lock()
+_generation_cache = None
+
+def get_generation_cache():
+    """Disk cache of generated posts keyed by hash(model, prompt, data_context)."""
+    global _generation_cache
+    if _generation_cache is None:
+        _generation_cache = GenerationCache()
+    return _generation_cache
+
+US_INDICES = ["^IXIC", "^DJI", "^GSPC"]
+KR_INDICES = ["^KS11", "^KQ11"]
 
 def get_nasdaq_data():
     """Fetches Nasdaq Composite data for the previous trading day."""
-    print("Fetching Nasdaq data...")
-    nasdaq = yf.Ticker("^IXIC")
-    # Get recent history (last 5 days to ensure we get the previous trading day)
-    hist = nasdaq.history(period="5d")
-    
-    if hist.empty:
-        return None
-        
-    # Get the last row (most recent trading day)
-    last_day = hist.iloc[-1]
-    prev_day = hist.iloc[-2] if len(hist) > 1 else last_day # Compare with day before if possible
-    
-    change = last_day['Close'] - prev_day['Close']
-    change_percent = (change / prev_day['Close']) * 100
-    
-    data = {
-        "date": last_day.name.strftime('%Y-%m-%d'),
-        "close": round(last_day['Close'], 2),
-        "open": round(last_day['Open'], 2),
-        "high": round(last_day['High'], 2),
-        "low": round(last_day['Low'], 2),
-        "volume": last_day['Volume'],
-        "change": round(change, 2),
-        "change_percent": round(change_percent, 2)
-    }
-    return data
+    return get_market_snapshot(["^IXIC"]).get("^IXIC")
+
+def format_index_context(tickers):
+    """Builds the prompt data context for several indices (None if nothing could be fetched)."""
+    # 모든 지수를 한 번에 받아 거래일 단위로 캐시한 스냅샷 사용
+    snapshot = get_market_snapshot(tickers)
+    blocks = []
+    for ticker, data in snapshot.items():
+        blocks.append(f"""
+            [{data['name']} ({ticker})]
+            Date: {data['date']}
+            Close: {data['close']}
+            Open: {data['open']}
+            High: {data['high']}
+            Low: {data['low']}
+            Change: {data['change']} ({data['change_percent']}%)
+            """)
+    return "".join(blocks) or None
 
 def get_google_finance_news():
     """Scrapes top news from Google Finance."""
@@ -122,7 +99,7 @@ def get_google_finance_news():
     }
     
     try:
-        response = requests.get(url, headers=headers)
+        response = requests.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
         
@@ -164,14 +141,22 @@ def get_google_finance_news():
         print(f"Error fetching news: {e}")
         return "Error fetching news."
 
-def generate_blog_content(topic, data_context):
-    """Generates blog post content using Gemini."""
+def generate_blog_content(topic, data_context, llm=None, cache=None, store=True):
+    """Generates blog post content using Gemini (or the given LLM client), reusing cached generations.
+
+    store=False (dry run) leaves no pending entry behind for retry_pending_posts().
+    """
     print(f"Generating content for: {topic}...")
     
-    if not GEMINI_API_KEY:
-        return "Error: Gemini API Key not found.", "Error"
-
-    model = genai.GenerativeModel('gemini-flash-latest')
+    global _llm_client
+    if llm is None:
+        with _llm_lock:
+            if _llm_client is None:
+                _llm_client = get_llm_client()
+        llm = _llm_client
+    if llm is None:
+        print("Error: Gemini API Key not found.")
+        return None
     
     today = datetime.date.today().strftime('%Y-%m-%d')
     
@@ -208,10 +193,12 @@ def generate_blog_content(topic, data_context):
     """
     
     try:
-        response = model.generate_content(prompt, generation_config={"response_mime_type": "application/json"})
-        import json
-        result = json.loads(response.text)
-        
+        cache = cache if cache is not None else get_generation_cache()
+        key, result, hit = generate_cached(llm, prompt, data_context, cache, store=store)
+        if hit:
+            print("Using cached generation.")
+        # 발행 결과를 같은 캐시 항목에 기록하기 위한 key (WordPress 로는 전송되지 않음)
+        result['_cache_key'] = key
         return result
     except Exception as e:
         print(f"Error generating content: {e}")
@@ -225,15 +212,16 @@ def post_to_wordpress(post_data_dict):
         print("Error: WordPress credentials missing.")
         return False
 
-    headers = get_wp_headers()
+    client = get_wp_client()
     
-    # Prepare tags
+    # Prepare tags (로컬 캐시에 없는 태그만 조회/생성, 새 태그는 한 번의 batch 요청으로 생성)
     tag_ids = []
     if 'tags' in post_data_dict:
-        for tag_name in post_data_dict['tags']:
-            tid = get_or_create_tag(tag_name)
-            if tid:
-                tag_ids.append(tid)
+        try:
+            resolved = client.resolve_terms("tags", post_data_dict['tags'])
+            tag_ids = [resolved[t.strip()] for t in post_data_dict['tags'] if t and t.strip() in resolved]
+        except Exception as e:
+            print(f"Error managing tags: {e}")
     
     wp_post_data = {
         "title": post_data_dict.get('title'),
@@ -245,80 +233,140 @@ def post_to_wordpress(post_data_dict):
     }
     
     try:
-        api_url = f"{WP_URL}/wp-json/wp/v2/posts"
-        response = requests.post(api_url, headers=headers, json=wp_post_data)
-        response.raise_for_status()
-        print(f"Successfully posted: {response.json().get('link')}")
+        post = client.create_post(wp_post_data)
+        print(f"Successfully posted: {post.get('link')}")
         return True
+    except WordPressError as e:
+        print(f"Error posting to WordPress: {e}")
+        if e.response is not None and e.response.status_code == 400 and client.term_cache is not None:
+            # 캐시된 term ID 가 삭제되었을 수 있으므로 다음 실행에서 목록을 다시 받음
+            client.term_cache.expire()
+        return False
     except Exception as e:
         print(f"Error posting to WordPress: {e}")
-        if 'response' in locals() and response:
-            print(f"Response: {response.text}")
         return False
 
-def main():
-    print(f"Starting automation script at {datetime.datetime.now()}")
-    
-    # Check day of the week
-    # Monday=0, Sunday=6
-    weekday = datetime.datetime.now().weekday()
-    
-    # User rule: Sunday (6) and Monday (0) -> Google Finance News
-    # Tuesday (1) to Saturday (5) -> Nasdaq Data (from previous trading day)
-    
-    if weekday in [6, 0]:
-        # Sunday or Monday
-        mode = "NEWS"
-        print("Mode: Google Finance News")
-        data = get_google_finance_news()
-        topic = "Global Financial Market News & Updates"
-    else:
-        # Tuesday to Saturday
-        mode = "MARKET"
-        print("Mode: Nasdaq Market Data")
-        data = get_nasdaq_data()
-        if data:
-            topic = f"Nasdaq Market Review ({data['date']})"
-            data_context = f"""
-            Date: {data['date']}
-            Close: {data['close']}
-            Open: {data['open']}
-            High: {data['high']}
-            Low: {data['low']}
-            Change: {data['change']} ({data['change_percent']}%)
+def publish_generated(generated_data, cache=None):
+    """Posts a generated article and records the outcome in the generation cache."""
+    cache = cache if cache is not None else get_generation_cache()
+    key = generated_data.get('_cache_key')
+    entry = cache.get(key) if key else None
+    if entry is not None and entry.get('published'):
+        print("Already published (cached generation). Skipping.")
+        return True
+    # 글 생성(POST)은 재시도에 안전하지 않음: 이전 시도가 응답만 잃고 실제로는 발행되었을 수 있음
+    attempted = bool(entry and entry['result'].get('_attempted'))
+    if key:
+        # 카테고리 등 발행에 필요한 값까지 저장해 두어야 실패 시 그대로 재발행 가능
+        generated_data['_attempted'] = True
+        cache.update(key, result=generated_data)
+    if attempted:
+        try:
+            existing = get_wp_client().find_post(generated_data.get('title'))
+        except Exception as e:
+            print(f"Error checking for an earlier publish, will retry later: {e}")
+            return False
+        if existing is not None:
+            print(f"Already on WordPress: {existing.get('link')}")
+            cache.update(key, published=True)
+            return True
+    ok = post_to_wordpress(generated_data)
+    if ok and key:
+        cache.update(key, published=True)
+    return ok
+
+def retry_pending_posts(cache=None):
+    """Re-publishes cached generations whose earlier publish failed (no new LLM call)."""
+    cache = cache if cache is not None else get_generation_cache()
+    for key, result in list(cache.pending()):
+        print(f"Retrying unpublished post: {result.get('title')}")
+        result['_cache_key'] = key
+        publish_generated(result, cache)
+
+def get_news_context():
+    news = get_google_finance_news()
+    return None if not news or news.startswith("Error") else news
+
+def get_watch_context(code):
+    """투자경고/투자주의/단기과열 요건에 해당하는 종목만 글감으로 사용 (해당 없으면 None)."""
+    report = generate_stock_report(code)
+    if not report.get("ok"):
+        return None
+    status = report["results"]
+    if not any(status[k]["triggered"] for k in ("warning", "caution", "overheating")):
+        return None
+    meta = report["meta"]
+    return f"""
+            Stock: {meta.get('stock_name') or code} ({code}, {meta.get('market') or 'KRX'})
+            As of: {meta['as_of']}
+            Close: {meta['latest_close']}
+            KRX designation checks (triggered / details):
+            {json.dumps(status, ensure_ascii=False)}
             """
-            data = data_context # Reassign for prompt
-        else:
-            print("Failed to fetch Nasdaq data.")
-            return
 
-    if not data:
-        print("No data collected. Exiting.")
-        return
+def default_topics(weekday, watch_codes):
+    # User rule: Sunday (6) and Monday (0) -> Google Finance News
+    # Tuesday (1) to Saturday (5) -> index data (from previous trading day)
+    topics = ["news"] if weekday in [6, 0] else ["us", "kr"]
+    if watch_codes:
+        topics.append("watch")
+    return topics
 
-    # Prepare Category
-    category_id = None
-    if mode == "MARKET":
-        category_id = get_or_create_category(CATEGORY_US_STOCKS)
-    elif mode == "NEWS":
-        # For now, put global news in US stocks or both? Let's default to US for now as it's global/US centric
-        category_id = get_or_create_category(CATEGORY_US_STOCKS)
-        
-    # Ensure "Korean Stocks" category exists for future use
-    get_or_create_category(CATEGORY_KR_STOCKS)
+def build_jobs(topics, watch_codes):
+    jobs = []
+    if "us" in topics:
+        jobs.append(PostJob("us_indices", "US Stock Market Review (Nasdaq, Dow Jones, S&P 500)",
+                            CATEGORY_US_STOCKS, lambda: format_index_context(US_INDICES)))
+    if "kr" in topics:
+        jobs.append(PostJob("kr_indices", "Korean Stock Market Review (KOSPI, KOSDAQ)",
+                            CATEGORY_KR_STOCKS, lambda: format_index_context(KR_INDICES)))
+    if "news" in topics:
+        # For now, put global news in US stocks as it's global/US centric
+        jobs.append(PostJob("news", "Global Financial Market News & Updates", CATEGORY_US_STOCKS, get_news_context))
+    if "watch" in topics:
+        for code in watch_codes:
+            jobs.append(PostJob(f"watch:{code}", f"투자경고/투자주의 지정 요건 점검 ({code})",
+                                CATEGORY_KR_STOCKS, partial(get_watch_context, code)))
+    return jobs
 
-    # Generate Content
-    generated_data = generate_blog_content(topic, data)
-    
-    if generated_data:
-        # Add category to data
-        if category_id:
-            generated_data['category_ids'] = [category_id]
-            
-        # Post to WordPress
-        post_to_wordpress(generated_data)
+def main():
+    parser = argparse.ArgumentParser(description="워드프레스 주식 블로그 자동 발행")
+    parser.add_argument("--topics", default=None,
+                        help="쉼표로 구분: us,kr,news,watch (기본: 일/월 news, 화~토 us,kr + watch)")
+    parser.add_argument("--watch", default=os.getenv("WATCH_CODES", ""),
+                        help="투자경고 watch 글 대상 종목코드 (쉼표 구분, 기본: WATCH_CODES)")
+    parser.add_argument("--llm-concurrency", type=int, default=int(os.getenv("LLM_CONCURRENCY", "2")),
+                        help="동시에 실행할 글 생성 수")
+    parser.add_argument("--fetch-workers", type=int, default=8, help="동시 데이터 조회 수")
+    parser.add_argument("--dry-run", action="store_true", help="발행하지 않고 생성까지만 실행")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    print(f"Starting automation script at {datetime.datetime.now()}")
+
+    if WP_URL and WP_USERNAME and WP_APP_PASSWORD and not args.dry_run:
+        retry_pending_posts()
+
+    watch_codes = [c.strip() for c in args.watch.split(",") if c.strip()]
+    if args.topics:
+        topics = [t.strip() for t in args.topics.split(",")]
     else:
-        print("Failed to generate content.")
+        # Monday=0, Sunday=6
+        topics = default_topics(datetime.datetime.now().weekday(), watch_codes)
+    jobs = build_jobs(topics, watch_codes)
+    print(f"Topics: {', '.join(job.key for job in jobs) or '-'}")
+
+    results = run_pipeline(
+        jobs,
+        generate=partial(generate_blog_content, store=not args.dry_run),
+        publish=publish_generated,
+        resolve_category=get_or_create_category,
+        fetch_workers=args.fetch_workers,
+        llm_concurrency=args.llm_concurrency,
+        dry_run=args.dry_run,
+    )
+    print()
+    print_summary(results, time.perf_counter() - started)
 
 if __name__ == "__main__":
     main()
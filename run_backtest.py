@@ -0,0 +1,52 @@
+import argparse
+import sys
+import time
+from tabulate import tabulate
+from src.backtest import load_events, run_backtest
+from src.screener import universe_codes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지정 요건 검사기 백테스트 (실제 지정 이력과 비교)")
+    parser.add_argument("events", help="실제 지정 이력 CSV (헤더: code,date,type)")
+    parser.add_argument("--start", required=True, help="백테스트 시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="백테스트 종료일 (YYYY-MM-DD)")
+    parser.add_argument("--codes", nargs="*", default=None, help="대상 종목코드 (생략 시 이력 CSV 의 종목)")
+    parser.add_argument("--universe", action="store_true", help="KRX 전 종목 대상 (오탐까지 시장 전체로 측정)")
+    parser.add_argument("--horizon", type=int, default=5, help="신호와 지정 사이 허용 봉 수")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+
+    events = load_events(args.events)
+    if args.universe:
+        codes = universe_codes()
+    else:
+        codes = args.codes or sorted(events["code"].unique())
+    if not codes:
+        print("대상 종목이 없습니다.")
+        sys.exit(1)
+
+    print(f"{len(codes)}개 종목 / 지정 이력 {len(events)}건 / {args.start} ~ {args.end}")
+    started = time.perf_counter()
+    done = 0
+
+    def progress(res):
+        nonlocal done
+        done += 1
+        if "error" in res:
+            print(f"  [{done}/{len(codes)}] {res['code']}: {res['error']}")
+        elif done % 50 == 0 or done == len(codes):
+            print(f"  [{done}/{len(codes)}] {time.perf_counter() - started:.1f}s")
+
+    summary, results = run_backtest(
+        codes, events, args.start, args.end, horizon=args.horizon, max_workers=args.workers, on_result=progress
+    )
+
+    print()
+    print(tabulate(summary, headers="keys", tablefmt="simple", showindex=False, floatfmt=".3f"))
+    failed = sum(1 for r in results if "error" in r)
+    print(f"\n{len(results) - failed}개 종목 완료, 실패 {failed} / {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
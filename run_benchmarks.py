@@ -0,0 +1,257 @@
+"""
+Benchmarks for the report pipeline, checkers and API.
+
+네트워크 없이 합성 OHLCV 데이터(LocalFileProvider + 임시 저장소)로 실행하므로 결과가 결정적입니다.
+단계별 지연시간 백분위수(p50/p95/p99)와 최대 메모리(tracemalloc)를 출력하고,
+--save / --compare 로 이전 결과 대비 회귀를 검사할 수 있습니다.
+
+    python run_benchmarks.py                          # 기본 (길이 120,1000,5000 / 종목 100,1000)
+    python run_benchmarks.py --quick                  # 빠른 확인
+    python run_benchmarks.py --save bench.json
+    python run_benchmarks.py --compare bench.json --tolerance 0.25   # p50 이 25% 이상 느려지면 exit 1
+"""
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+# src 모듈을 import 하기 전에 저장소/공급원을 임시 디렉터리로 돌려야 함
+_WORKDIR = Path(tempfile.mkdtemp(prefix="stock-bench-"))
+atexit.register(shutil.rmtree, _WORKDIR, ignore_errors=True)
+os.environ["STOCK_CACHE_DIR"] = str(_WORKDIR / "cache")
+os.environ["STOCK_LOCAL_DATA_DIR"] = str(_WORKDIR / "fixtures")
+os.environ["STOCK_PROVIDERS"] = "local"
+os.environ["STOCK_NAME_PROVIDERS"] = "local"
+os.environ["STOCK_SNAPSHOT"] = "0"
+
+from src.listing import get_listing_index  # noqa: E402
+from src.checkers.caution import check_caution  # noqa: E402
+from src.checkers.overheating import check_overheating  # noqa: E402
+from src.checkers.warning import check_warning  # noqa: E402
+from src.checkers.warning_release import get_release_schedule  # noqa: E402
+from src.indicators import calculate_indicators, compute_indicator_frame  # noqa: E402
+from src.providers import LocalFileProvider  # noqa: E402
+from src.report import _to_builtin, build_stock_report, generate_stock_report, report_cache  # noqa: E402
+from src.screener import screen  # noqa: E402
+
+SHARES = 50_000_000
+
+
+def synthetic_frame(n: int, seed: int = 0, end: str | None = None) -> pd.DataFrame:
+    """
+    Random-walk daily bars ending at `end` (default: yesterday), with occasional spikes
+    so that the checkers hit both branches.
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end) if end else pd.Timestamp(date.today()) - pd.Timedelta(days=1)
+    index = pd.bdate_range(end=end, periods=n, name="Date")
+    returns = rng.normal(0.001, 0.03, n)
+    returns[rng.random(n) < 0.02] += 0.25
+    close = np.round(10_000 * np.cumprod(1 + returns))
+    spread = np.abs(rng.normal(0, 0.02, n))
+    return pd.DataFrame(
+        {
+            "Open": np.round(close * (1 + rng.normal(0, 0.01, n))),
+            "High": np.round(close * (1 + spread)),
+            "Low": np.round(close * (1 - spread)),
+            "Close": close,
+            "Volume": rng.integers(10_000, 5_000_000, n),
+        },
+        index=index,
+    )
+
+
+def measure(fn, repeat: int, warmup: int = 2) -> dict:
+    for _ in range(warmup):
+        fn()
+    samples = np.empty(repeat)
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples[i] = time.perf_counter() - t0
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms = samples * 1000
+    return {
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+        "peak_kb": peak / 1024,
+    }
+
+
+def setup_universe(size: int, bars: int) -> list[str]:
+    """
+    Writes `size` synthetic codes as local fixtures and a matching listing.csv
+    (STOCK_PROVIDERS / STOCK_NAME_PROVIDERS=local 이므로 상장 목록도 여기서 읽음).
+    """
+    provider = LocalFileProvider()
+    codes = [f"{900000 + i:06d}" for i in range(size)]
+    for i, code in enumerate(codes):
+        if not (provider.root / f"{code}.csv").exists():
+            provider.save(code, synthetic_frame(bars, seed=i))
+    provider.save_listing(pd.DataFrame({
+        "code": codes,
+        "name": [f"합성{i}" for i in range(size)],
+        "market": "KOSPI",
+        "shares": SHARES,
+    }))
+    get_listing_index(refresh=True)
+    return codes
+
+
+def bench_stages(lengths: list[int], repeat: int) -> list[dict]:
+    rows = []
+    for n in lengths:
+        df = synthetic_frame(n, seed=n)
+        frame = compute_indicator_frame(df)
+        indicators = calculate_indicators(df.copy())
+        report = build_stock_report("900000", None, "합성", df, None)
+        designation = df.index[max(0, n - 30)].strftime("%Y-%m-%d")
+
+        cases = {
+            "calculate_indicators": lambda: calculate_indicators(df.copy()),
+            "compute_indicator_frame": lambda: compute_indicator_frame(df),
+            "check_caution": lambda: check_caution(frame),
+            "check_warning": lambda: check_warning(frame),
+            "check_overheating": lambda: check_overheating(frame),
+            "check_all(DataFrame)": lambda: (check_caution(indicators), check_warning(indicators), check_overheating(indicators)),
+            "get_release_schedule": lambda: get_release_schedule(df, designation),
+            "_to_builtin": lambda: _to_builtin(report),
+            "build_stock_report": lambda: build_stock_report("900000", None, "합성", df, None),
+        }
+        for name, fn in cases.items():
+            rows.append({"case": name, "size": n, **measure(fn, repeat)})
+    return rows
+
+
+def bench_pipeline(universe: list[int], repeat: int, bars: int = 250) -> list[dict]:
+    rows = []
+    codes = setup_universe(max(universe), bars)
+    # 저장소를 채워 두고(첫 조회) 이후는 캐시된 경로를 측정
+    for code in codes:
+        generate_stock_report(code)
+
+    rows.append({"case": "generate_stock_report(store)", "size": bars,
+                 **measure(lambda: generate_stock_report(codes[0]), repeat)})
+    for size in universe:
+        subset = codes[:size]
+        rows.append({"case": "screen", "size": size, **measure(lambda: screen(codes=subset), max(3, repeat // 10), warmup=1)})
+    return rows
+
+
+async def _load(app, codes: list[str], requests: int, concurrency: int) -> tuple[np.ndarray, float]:
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one(i: int):
+            async with semaphore:
+                t0 = time.perf_counter()
+                resp = await client.get(f"/api/stock/{codes[i % len(codes)]}")
+                latencies.append(time.perf_counter() - t0)
+                assert resp.status_code == 200, resp.text
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - started
+    return np.asarray(latencies) * 1000, elapsed
+
+
+def bench_api(requests: int, concurrency: int, universe: int) -> list[dict]:
+    from api.app import create_app
+
+    codes = setup_universe(universe, 250)
+    app = create_app()
+    rows = []
+    for label, clear in [("api cold (cache cleared)", True), ("api warm (report_cache)", False)]:
+        if clear:
+            report_cache.clear()
+        tracemalloc.start()
+        ms, elapsed = asyncio.run(_load(app, codes, requests, concurrency))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append({
+            "case": label,
+            "size": concurrency,
+            "p50_ms": float(np.percentile(ms, 50)),
+            "p95_ms": float(np.percentile(ms, 95)),
+            "p99_ms": float(np.percentile(ms, 99)),
+            "mean_ms": float(ms.mean()),
+            "peak_kb": peak / 1024,
+            "rps": requests / elapsed,
+        })
+    return rows
+
+
+def compare(rows: list[dict], baseline_path: str, tolerance: float) -> list[str]:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["case"], r["size"]): r for r in json.load(f)}
+    regressions = []
+    for r in rows:
+        base = baseline.get((r["case"], r["size"]))
+        if base and r["p50_ms"] > base["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{r['case']} [{r['size']}]: p50 {base['p50_ms']:.3f} -> {r['p50_ms']:.3f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리포트 파이프라인/검사기/API 벤치마크 (합성 데이터, 오프라인)")
+    parser.add_argument("--lengths", default="120,1000,5000", help="일봉 길이 목록")
+    parser.add_argument("--universe", default="100,1000", help="스크리너 종목 수 목록")
+    parser.add_argument("--repeat", type=int, default=50, help="케이스별 반복 횟수")
+    parser.add_argument("--requests", type=int, default=500, help="API 부하 테스트 요청 수")
+    parser.add_argument("--concurrency", type=int, default=32, help="API 동시 요청 수")
+    parser.add_argument("--skip-api", action="store_true", help="API 부하 테스트 생략")
+    parser.add_argument("--quick", action="store_true", help="작은 크기로 빠르게 실행")
+    parser.add_argument("--save", default=None, help="결과를 JSON 으로 저장")
+    parser.add_argument("--compare", default=None, help="기준 결과 JSON 과 비교")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="회귀로 판단할 p50 증가율")
+    args = parser.parse_args()
+
+    lengths = [int(x) for x in args.lengths.split(",")]
+    universe = [int(x) for x in args.universe.split(",")]
+    if args.quick:
+        lengths, universe, args.repeat, args.requests = [120, 1000], [100], 10, 100
+
+    rows = bench_stages(lengths, args.repeat)
+    rows += bench_pipeline(universe, args.repeat)
+    if not args.skip_api:
+        rows += bench_api(args.requests, args.concurrency, min(200, max(universe)))
+
+    print(tabulate(rows, headers="keys", tablefmt="simple", floatfmt=".3f", missingval=""))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        regressions = compare(rows, args.compare, args.tolerance)
+        if regressions:
+            print("\n성능 회귀:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\n회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import time
+from tabulate import tabulate
+from src.screener import screen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KRX 전 종목 지정 요건 스크리너")
+    parser.add_argument("codes", nargs="*", help="대상 종목코드 (생략 시 KRX 전 종목)")
+    parser.add_argument("--refresh", action="store_true", help="스크리닝 전에 로컬 저장소를 원격 데이터로 갱신")
+    parser.add_argument("--workers", type=int, default=8, help="--refresh 시 동시 조회 수")
+    parser.add_argument("--top", type=int, default=30, help="출력할 상위 종목 수")
+    parser.add_argument("--all", action="store_true", help="조건 미충족 종목도 포함")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    table = screen(
+        codes=args.codes or None,
+        refresh=args.refresh,
+        max_workers=args.workers,
+        only_triggered=not args.all,
+    )
+    elapsed = time.perf_counter() - started
+
+    if table.empty:
+        print("결과 없음. (로컬 저장소가 비어 있다면 --refresh 로 먼저 데이터를 받아주세요)")
+        return
+
+    view = table.head(args.top).copy()
+    view["as_of"] = view["as_of"].dt.strftime("%Y-%m-%d")
+    view["gap"] = view["gap"].map(lambda g: f"{g:.2%}" if g == g else "-")
+    for col in ["warning", "caution", "overheating"]:
+        view[col] = view[col].map(lambda b: "O" if b else "")
+    print(tabulate(view, headers="keys", tablefmt="simple", showindex=False, floatfmt=",.0f"))
+    print(f"\n{len(table)}개 종목 / {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
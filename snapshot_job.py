@@ -0,0 +1,27 @@
+import argparse
+import json
+from src.screener import universe_codes
+from src.snapshot import get_snapshot_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전 종목 리포트 스냅샷 생성 (장 마감 후 1회 실행)")
+    parser.add_argument("codes", nargs="*", help="대상 종목코드 (생략 시 KRX 전 종목)")
+    parser.add_argument("--session", default=None, help="스냅샷 기준일 YYYY-MM-DD (기본: 오늘)")
+    parser.add_argument("--workers", type=int, default=8, help="동시 조회 수")
+    parser.add_argument("--limit", type=int, default=None, help="앞에서부터 N개 종목만 처리")
+    parser.add_argument("--no-resume", action="store_true", help="이미 저장된 종목도 다시 계산")
+    args = parser.parse_args()
+
+    codes = args.codes or universe_codes()
+    if args.limit:
+        codes = codes[: args.limit]
+
+    store = get_snapshot_store()
+    print(f"{len(codes)}개 종목 스냅샷 생성 → {store.path}")
+    metrics = store.run_job(codes, session=args.session, workers=args.workers, resume=not args.no_resume)
+    print(json.dumps(metrics, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
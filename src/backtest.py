@@ -0,0 +1,196 @@
+"""
+Backtest of the designation heuristics against actual KRX designations.
+
+종목별로 기간 전체의 일봉을 한 번에 읽어 evaluate_history 로 모든 날짜의 신호를 배열 연산으로 구하고,
+실제 지정 이력(CSV)과 비교해 정밀도(precision) / 재현율(recall) / 선행 일수(lead time)를 계산합니다.
+종목 단위 작업은 서로 독립이므로 프로세스 풀로 병렬 실행합니다.
+
+판정 기준 (horizon = N 봉):
+- 신호일 t 는 t 다음 N 봉 안에 같은 종류의 실제 지정이 있으면 적중(true positive)
+- 지정일 E 는 E 이전 N 봉 안에 신호가 있으면 탐지, 선행 일수 = E - (그 구간의 첫 신호일) [봉]
+"""
+from __future__ import annotations
+
+import csv
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.checkers.history import evaluate_history
+from src.data_fetcher import get_stock_data
+from src.indicators import calculate_indicators
+
+KINDS = ("caution", "warning", "overheating")
+
+_KIND_ALIASES = {
+    "caution": "caution", "투자주의": "caution", "투자주의종목": "caution",
+    "warning": "warning", "투자경고": "warning", "투자경고종목": "warning",
+    "overheating": "overheating", "단기과열": "overheating", "단기과열종목": "overheating",
+}
+
+# 시작일의 MA_40 / T-15 계산을 위한 여유 기간 (달력 기준)
+_LOOKBACK_DAYS = 90
+
+
+def load_events(path: str) -> pd.DataFrame:
+    """
+    Reads actual designation events from a CSV with header code,date,type.
+
+    type: caution / warning / overheating (또는 투자주의 / 투자경고 / 단기과열)
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    records = []
+    for row in rows:
+        code = str(row.get("code", "")).strip()
+        kind = _KIND_ALIASES.get(str(row.get("type", "")).strip().lower())
+        try:
+            date = pd.Timestamp(str(row.get("date", "")).strip())
+        except ValueError:
+            continue
+        if code and kind and not pd.isna(date):
+            records.append({"code": code.zfill(6) if code.isdigit() else code, "date": date, "type": kind})
+    return pd.DataFrame(records, columns=["code", "date", "type"])
+
+
+def _window_count(flags: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    Number of True flags in [lo, hi) for each pair, via a prefix sum.
+    """
+    csum = np.concatenate([[0], np.cumsum(flags, dtype=np.int64)])
+    lo = np.clip(lo, 0, len(flags))
+    hi = np.clip(hi, 0, len(flags))
+    return csum[hi] - csum[np.minimum(lo, hi)]
+
+
+def match_signals(signals: np.ndarray, event_pos: np.ndarray, horizon: int) -> dict[str, Any]:
+    """
+    Scores one bool signal series against event bar positions (all vectorized).
+    """
+    n = len(signals)
+    event_pos = np.unique(event_pos[(event_pos >= 0) & (event_pos < n)])
+    events = np.zeros(n, dtype=bool)
+    events[event_pos] = True
+
+    sig_pos = np.flatnonzero(signals)
+    # 신호일 t: (t, t + horizon] 안에 지정이 있으면 적중
+    hits = _window_count(events, sig_pos + 1, sig_pos + horizon + 1) > 0
+
+    # 지정일 E: [E - horizon, E) 안의 첫 신호
+    first = np.searchsorted(sig_pos, event_pos - horizon, side="left")
+    detected = np.zeros(len(event_pos), dtype=bool)
+    ok = first < len(sig_pos)
+    detected[ok] = sig_pos[first[ok]] < event_pos[ok]
+    leads = event_pos[detected] - sig_pos[first[detected]]
+
+    return {
+        "signals": int(len(sig_pos)),
+        "true_positives": int(hits.sum()),
+        "events": int(len(event_pos)),
+        "detected": int(detected.sum()),
+        "leads": leads.tolist(),
+    }
+
+
+def backtest_code(
+    code: str,
+    events: pd.DataFrame,
+    start: str,
+    end: str,
+    horizon: int = 5,
+    loader: Callable[..., Optional[pd.DataFrame]] = get_stock_data,
+) -> dict[str, Any]:
+    """
+    Replays one code over [start, end] and scores each checker against its events.
+
+    events: 이 종목의 (date, type) 행. 프로세스 풀 워커에서 실행되므로 모듈 최상위 함수입니다.
+    """
+    start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+    df = loader(code, days=(end_ts - start_ts).days + _LOOKBACK_DAYS, end=end_ts)
+    if df is None or df.empty:
+        return {"code": code, "error": "데이터 조회 실패"}
+
+    df = calculate_indicators(df.copy())
+    history = evaluate_history(df)
+    history = history.iloc[history.index.searchsorted(start_ts, side="left"):]
+    if history.empty:
+        return {"code": code, "error": "기간 내 데이터 없음"}
+
+    index = history.index
+    result: dict[str, Any] = {"code": code, "bars": len(index)}
+    for kind in KINDS:
+        dates = pd.DatetimeIndex(events.loc[events["type"] == kind, "date"])
+        # 기간 밖 지정일은 searchsorted 가 첫/마지막 봉으로 끌어오므로 먼저 제외
+        dates = dates[(dates >= start_ts) & (dates <= end_ts)]
+        # 휴장일에 해당하는 지정일은 다음 거래일로
+        pos = index.searchsorted(dates, side="left")
+        result[kind] = match_signals(history[kind].to_numpy(dtype=bool), np.asarray(pos), horizon)
+    return result
+
+
+def summarize(results: Iterable[dict[str, Any]]) -> pd.DataFrame:
+    """
+    Aggregates per-code results into precision / recall / lead time per checker.
+    """
+    totals = {k: {"signals": 0, "true_positives": 0, "events": 0, "detected": 0, "leads": []} for k in KINDS}
+    for res in results:
+        for kind in KINDS:
+            part = res.get(kind)
+            if not part:
+                continue
+            for key in ("signals", "true_positives", "events", "detected"):
+                totals[kind][key] += part[key]
+            totals[kind]["leads"].extend(part["leads"])
+
+    rows = []
+    for kind, t in totals.items():
+        leads = np.asarray(t["leads"], dtype=float)
+        rows.append({
+            "type": kind,
+            "signals": t["signals"],
+            "true_positives": t["true_positives"],
+            "precision": t["true_positives"] / t["signals"] if t["signals"] else np.nan,
+            "events": t["events"],
+            "detected": t["detected"],
+            "recall": t["detected"] / t["events"] if t["events"] else np.nan,
+            "lead_mean": leads.mean() if len(leads) else np.nan,
+            "lead_median": float(np.median(leads)) if len(leads) else np.nan,
+        })
+    return pd.DataFrame(rows)
+
+
+def run_backtest(
+    codes: Iterable[str],
+    events: pd.DataFrame,
+    start: str,
+    end: str,
+    horizon: int = 5,
+    max_workers: Optional[int] = None,
+    on_result: Optional[Callable[[dict[str, Any]], None]] = None,
+) -> tuple[pd.DataFrame, list[dict[str, Any]]]:
+    """
+    Backtests every code in a process pool. Returns (summary, per-code results).
+    """
+    codes = list(dict.fromkeys(codes))
+    by_code = {code: group for code, group in events.groupby("code")}
+    empty = events.iloc[0:0]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(backtest_code, code, by_code.get(code, empty), start, end, horizon): code
+            for code in codes
+        }
+        for future in as_completed(futures):
+            try:
+                res = future.result()
+            except Exception as e:
+                res = {"code": futures[future], "error": str(e)}
+            results.append(res)
+            if on_result is not None:
+                on_result(res)
+
+    return summarize(r for r in results if "error" not in r), results
@@ -1,3 +1,14 @@
+from src.checkers.common import as_pandas, column, latest_row, signals_to_frame
+
+# KRX 투자주의종목 기준 (OHLCV 데이터 기반)
+THRESH_3D_CAUTION = 0.15      # 소수계좌거래집중: 3일 상승률
+THRESH_3D_VOLUME = 30000      # 소수계좌거래집중: 일평균거래량
+THRESH_CLOSE_CHANGE = 0.05    # 종가급변: 직전가격 대비
+THRESH_TOTAL_VOLUME = 30000   # 종가급변: 거래량
+THRESH_15D_CAUTION = 0.75     # 15일간 상승률
+MIN_BARS = 15
+
+
 def check_caution(df):
     """
     Checks for Investment Caution criteria.
@@ -10,44 +21,45 @@ def check_caution(df):
     
     Returns: (is_triggered, details)
     """
-    if df is None or len(df) < 15:
+    if df is None or len(df) < MIN_BARS:
         return False, "데이터 부족"
         
-    latest = df.iloc[-1]
+    latest = latest_row(df)
+    close = column(df, 'Close')
     
     # 가격 변동률
     change_1d = latest.get('Change_1d', 0)  # 전일 대비
     change_3d = latest.get('Change_3d', 0)
     change_15d = latest.get('Change_15d', 0)
-    change_from_prev = latest.get('Change_from_prev', 0)  # 직전가격 대비
+    change_from_prev = change_1d  # 직전가격(= 전일 종가) 대비
     
     # 거래량 정보
     current_volume = latest.get('Volume', 0)
     
     # 최근 3일 평균 거래량
-    recent_3d_vol = df.iloc[-3:]['Volume'].mean() if len(df) >= 3 else current_volume
+    recent_3d_vol = column(df, 'Volume')[-3:].mean() if len(df) >= 3 else current_volume
     
     # Base prices for calculation
-    price_3d_ago = df.iloc[-4]['Close'] if len(df) >= 4 else None
-    price_15d_ago = df.iloc[-16]['Close'] if len(df) >= 16 else None
-    prev_close = df.iloc[-2]['Close'] if len(df) >= 2 else None
+    price_3d_ago = close[-4] if len(df) >= 4 else None
+    price_15d_ago = close[-16] if len(df) >= 16 else None
+    prev_close = close[-2] if len(df) >= 2 else None
     
     # KRX 투자주의종목 기준 (OHLCV 데이터 기반)
     # 1. 소수계좌거래집중종목: 최근 3일간 주가상승률 15% 이상
     #    (시장지수 8% 이상일 경우 25% 이상 - 시장지수 정보 없으므로 15% 기준)
-    thresh_3d_caution_normal = 0.15
+    thresh_3d_caution_normal = THRESH_3D_CAUTION
     thresh_3d_caution_high = 0.25  # 시장지수 상승률 높을 때
-    thresh_3d_volume = 30000  # 일평균거래량 3만주 이상
+    thresh_3d_volume = THRESH_3D_VOLUME  # 일평균거래량 3만주 이상
     
     # 2. 종가급변종목: 종가가 직전가격 대비 5% 이상 상승(하락)
     #    + 종가 거래량이 전체 거래량의 5% 이상 (정확한 종가 거래량 없으므로 전체 거래량 사용)
     #    + 전체 거래량 3만주 이상
-    thresh_close_change = 0.05
+    thresh_close_change = THRESH_CLOSE_CHANGE
     thresh_close_vol_ratio = 0.05
-    thresh_total_volume = 30000
+    thresh_total_volume = THRESH_TOTAL_VOLUME
     
     # 3. 15일간 상승종목: 최근 15일간 주가상승률 75% 이상
-    thresh_15d_caution = 0.75
+    thresh_15d_caution = THRESH_15D_CAUTION
     
     # 조건 체크
     # 1. 소수계좌거래집중종목 (3일 15% 이상 + 거래량 3만주 이상)
@@ -99,3 +111,51 @@ def check_caution(df):
     }
     
     return is_triggered, details
+
+
+def caution_signals(cols):
+    """
+    Vectorized check_caution over every row.
+
+    cols: calculate_indicators 결과 DataFrame(한 종목) 또는
+          calculate_panel_indicators 결과 panel(field -> bars x codes).
+    각 행을 '그날이 마지막 봉'인 것처럼 평가하므로 마지막 행은 check_caution 과 같은 결과입니다.
+
+    Returns: (triggered, {조건명: {"triggered": ..., "target_price": ...}})
+    """
+    close = cols['Close']
+    volume = cols['Volume']
+    enough = close.notna().cumsum() >= MIN_BARS
+
+    recent_3d_vol = volume.rolling(window=3, min_periods=1).mean()
+    cond_minority_account = enough & (cols['Change_3d'] >= THRESH_3D_CAUTION) & (recent_3d_vol >= THRESH_3D_VOLUME)
+    cond_close_abrupt = enough & (cols['Change_1d'].abs() >= THRESH_CLOSE_CHANGE) & (volume >= THRESH_TOTAL_VOLUME)
+    cond_15d_rise = enough & (cols['Change_15d'] >= THRESH_15D_CAUTION)
+
+    signals = {
+        "소수계좌거래집중(3일)": {
+            "triggered": cond_minority_account,
+            "target_price": close.shift(3) * (1 + THRESH_3D_CAUTION),
+        },
+        "종가급변종목": {
+            "triggered": cond_close_abrupt,
+            "target_price": close.shift(1) * (1 + THRESH_CLOSE_CHANGE),
+        },
+        "15일간상승종목": {
+            "triggered": cond_15d_rise,
+            "target_price": close.shift(15) * (1 + THRESH_15D_CAUTION),
+        },
+    }
+    return cond_minority_account | cond_close_abrupt | cond_15d_rise, signals
+
+
+def check_caution_history(df):
+    """
+    Full-history mode of check_caution: evaluates every row in one vectorized pass.
+
+    df: calculate_indicators 결과 DataFrame.
+    Returns: DataFrame(index=df.index) - "triggered", 조건별 bool 컬럼, "<조건명>:target_price" 컬럼
+    """
+    df = as_pandas(df)
+    triggered, signals = caution_signals(df)
+    return signals_to_frame(triggered, signals, df.index)
@@ -0,0 +1,43 @@
+import pandas as pd
+
+
+def signals_to_frame(triggered, signals, index):
+    """
+    Flattens the (triggered, {조건명: {...}}) output of a *_signals() function into a DataFrame.
+
+    컬럼: "triggered", 조건명(bool), "<조건명>:<값 이름>" (target_price / threshold 등)
+    """
+    data = {"triggered": triggered}
+    for name, sig in signals.items():
+        data[name] = sig["triggered"]
+        for key, val in sig.items():
+            if key != "triggered":
+                data[f"{name}:{key}"] = val
+    frame = pd.DataFrame(data, index=index)
+    bool_cols = ["triggered", *signals.keys()]
+    frame[bool_cols] = frame[bool_cols].astype(bool)
+    return frame
+
+
+def latest_row(df):
+    """
+    Latest bar as a mapping: IndicatorFrame.latest() (plain dict) or DataFrame.iloc[-1].
+    """
+    latest = getattr(df, "latest", None)
+    return latest() if callable(latest) else df.iloc[-1]
+
+
+def column(df, name):
+    """
+    Column as a NumPy array (IndicatorFrame view or DataFrame column values).
+    """
+    col = df[name]
+    return col.to_numpy() if hasattr(col, "to_numpy") else col
+
+
+def as_pandas(df):
+    """
+    DataFrame for the vectorized *_signals() helpers (IndicatorFrame -> DataFrame).
+    """
+    to_pandas = getattr(df, "to_pandas", None)
+    return to_pandas() if callable(to_pandas) else df
@@ -0,0 +1,43 @@
+"""
+Full-history evaluation of all checkers.
+
+각 행을 '그날이 마지막 봉'인 것처럼 평가한 결과를 한 번에 계산합니다.
+(df.iloc[:i+1] 로 잘라 하루씩 다시 돌리는 O(n^2) 대신 rolling/shift 로 O(n))
+"""
+from typing import Optional
+
+import pandas as pd
+
+from src.checkers.caution import check_caution_history
+from src.checkers.overheating import check_overheating_history
+from src.checkers.warning import check_warning_history
+
+
+def evaluate_history(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    df: calculate_indicators 결과 DataFrame.
+    Returns: DataFrame(index=df.index) with "caution" / "warning" / "overheating" bool columns
+             and the per-condition columns prefixed by checker name (e.g. "caution.종가급변종목").
+    """
+    parts = {
+        "caution": check_caution_history(df),
+        "warning": check_warning_history(df),
+        "overheating": check_overheating_history(df),
+    }
+    out = pd.DataFrame({name: part["triggered"] for name, part in parts.items()}, index=df.index)
+    for name, part in parts.items():
+        out = out.join(part.drop(columns="triggered").add_prefix(f"{name}."))
+    return out
+
+
+def first_triggered(history: pd.DataFrame, column: str, since: Optional[str] = None) -> Optional[pd.Timestamp]:
+    """
+    Returns the first date on which `column` was True (optionally on/after `since`).
+    """
+    flags = history[column]
+    if since is not None:
+        flags = flags[flags.index >= pd.Timestamp(since)]
+    hits = flags.to_numpy(dtype=bool)
+    if not hits.any():
+        return None
+    return flags.index[hits.argmax()]
@@ -1,3 +1,11 @@
+from src.checkers.common import as_pandas, latest_row, signals_to_frame
+
+PRICE_MA_MULTIPLIER = 1.3
+VOL_RATIO_THRESHOLD = 5.0
+VOLATILITY_MA_MULTIPLIER = 1.5
+MIN_BARS = 41
+
+
 def check_overheating(df):
     """
     Checks for Short-term Overheating criteria.
@@ -11,30 +19,30 @@ def check_overheating(df):
     Note: Real criteria requires "2 out of 3" or specific sequences. 
     Here we check if the LATEST day matches these conditions.
     """
-    if df is None or len(df) < 41:
+    if df is None or len(df) < MIN_BARS:
         return False, "데이터 부족"
         
-    latest = df.iloc[-1]
+    latest = latest_row(df)
     
     # Thresholds
-    price_cond = latest['Close'] >= (latest['MA_40'] * 1.3)
-    vol_cond = latest['Vol_Ratio'] >= 5.0
-    volatility_cond = latest['Volatility'] >= (latest['Volatility_MA_40'] * 1.5)
+    price_cond = latest['Close'] >= (latest['MA_40'] * PRICE_MA_MULTIPLIER)
+    vol_cond = latest['Vol_Ratio'] >= VOL_RATIO_THRESHOLD
+    volatility_cond = latest['Volatility'] >= (latest['Volatility_MA_40'] * VOLATILITY_MA_MULTIPLIER)
     
     details = {
         "주가요건": {
             "val": latest['Close'],
-            "threshold": latest['MA_40'] * 1.3,
+            "threshold": latest['MA_40'] * PRICE_MA_MULTIPLIER,
             "triggered": bool(price_cond)
         },
         "회전율요건": {
             "val": latest['Vol_Ratio'],
-            "threshold": 5.0,
+            "threshold": VOL_RATIO_THRESHOLD,
             "triggered": bool(vol_cond)
         },
         "변동성요건": {
             "val": latest['Volatility'],
-            "threshold": latest['Volatility_MA_40'] * 1.5,
+            "threshold": latest['Volatility_MA_40'] * VOLATILITY_MA_MULTIPLIER,
             "triggered": bool(volatility_cond)
         }
     }
@@ -44,3 +52,39 @@ def check_overheating(df):
     is_triggered = price_cond and vol_cond and volatility_cond 
     
     return is_triggered, details
+
+
+def overheating_signals(cols):
+    """
+    Vectorized check_overheating over every row.
+
+    cols: calculate_indicators 결과 DataFrame(한 종목) 또는 panel(field -> bars x codes).
+    Returns: (triggered, {조건명: {"triggered": ..., "threshold": ...}})
+    """
+    close = cols['Close']
+    enough = close.notna().cumsum() >= MIN_BARS
+
+    price_threshold = cols['MA_40'] * PRICE_MA_MULTIPLIER
+    volatility_threshold = cols['Volatility_MA_40'] * VOLATILITY_MA_MULTIPLIER
+    price_cond = enough & (close >= price_threshold)
+    vol_cond = enough & (cols['Vol_Ratio'] >= VOL_RATIO_THRESHOLD)
+    volatility_cond = enough & (cols['Volatility'] >= volatility_threshold)
+
+    signals = {
+        "주가요건": {"triggered": price_cond, "threshold": price_threshold},
+        "회전율요건": {"triggered": vol_cond, "threshold": VOL_RATIO_THRESHOLD},
+        "변동성요건": {"triggered": volatility_cond, "threshold": volatility_threshold},
+    }
+    return price_cond & vol_cond & volatility_cond, signals
+
+
+def check_overheating_history(df):
+    """
+    Full-history mode of check_overheating: evaluates every row in one vectorized pass.
+
+    df: calculate_indicators 결과 DataFrame.
+    Returns: DataFrame(index=df.index) - "triggered", 조건별 bool 컬럼, "<조건명>:threshold" 컬럼
+    """
+    df = as_pandas(df)
+    triggered, signals = overheating_signals(df)
+    return signals_to_frame(triggered, signals, df.index)
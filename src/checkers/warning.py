@@ -1,3 +1,12 @@
+from src.checkers.common import as_pandas, column, latest_row, signals_to_frame
+
+# Thresholds (지정예고요건)
+THRESH_3D_WARNING = 1.00   # 초단기 급등
+THRESH_5D_WARNING = 0.60   # 단기 급등
+THRESH_15D_WARNING = 1.00  # 중장기 급등
+MIN_BARS = 15
+
+
 def check_warning(df):
     """
     Checks for Investment Warning criteria (지정예고 요건 중심).
@@ -18,22 +27,23 @@ def check_warning(df):
 
     Returns: (is_triggered, details)
     """
-    if df is None or len(df) < 15:
+    if df is None or len(df) < MIN_BARS:
         return False, "데이터 부족"
         
-    latest = df.iloc[-1]
+    latest = latest_row(df)
+    close = column(df, "Close")
     
     change_3d = float(latest.get("Change_3d", 0) or 0)
     change_5d = float(latest.get("Change_5d", 0) or 0)
     change_15d = float(latest.get("Change_15d", 0) or 0)
     
     # Base prices for calculation
-    price_3d_ago = df.iloc[-4]['Close'] if len(df) >= 4 else None
-    price_5d_ago = df.iloc[-6]['Close'] if len(df) >= 6 else None
-    price_15d_ago = df.iloc[-16]['Close'] if len(df) >= 16 else None
+    price_3d_ago = close[-4] if len(df) >= 4 else None
+    price_5d_ago = close[-6] if len(df) >= 6 else None
+    price_15d_ago = close[-16] if len(df) >= 16 else None
 
     # "해당일 종가가 최근 15일 종가 중 최고가" (공식 주의사항)
-    recent_15 = df.iloc[-15:]["Close"]
+    recent_15 = close[-15:]
     max_close_15 = float(recent_15.max())
     current_close = float(latest["Close"])
     is_highest_close_15d = current_close >= max_close_15
@@ -42,9 +52,9 @@ def check_warning(df):
     # Investment caution repeat logic removed per user request
 
     # Thresholds (지정예고요건)
-    thresh_3d = 1.00   # 초단기 급등
-    thresh_5d = 0.60   # 단기 급등
-    thresh_15d = 1.00  # 중장기 급등
+    thresh_3d = THRESH_3D_WARNING
+    thresh_5d = THRESH_5D_WARNING
+    thresh_15d = THRESH_15D_WARNING
 
     cond_3d = is_highest_close_15d and (change_3d >= thresh_3d)
     cond_5d = is_highest_close_15d and (change_5d >= thresh_5d)
@@ -96,3 +106,48 @@ def check_warning(df):
     }
 
     return is_triggered, details
+
+
+def warning_signals(cols):
+    """
+    Vectorized check_warning over every row.
+
+    cols: calculate_indicators 결과 DataFrame(한 종목) 또는 panel(field -> bars x codes).
+    Returns: (triggered, {조건명: {"triggered": ..., "target_price": ...}})
+    """
+    close = cols['Close']
+    enough = close.notna().cumsum() >= MIN_BARS
+    # 해당일 종가가 최근 15일 종가 중 최고가
+    at_max = enough & (close >= close.rolling(window=15).max())
+
+    cond_3d = at_max & (cols['Change_3d'] >= THRESH_3D_WARNING)
+    cond_5d = at_max & (cols['Change_5d'] >= THRESH_5D_WARNING)
+    cond_15d = at_max & (cols['Change_15d'] >= THRESH_15D_WARNING)
+
+    signals = {
+        "초단기급등(3일)": {
+            "triggered": cond_3d,
+            "target_price": close.shift(3) * (1 + THRESH_3D_WARNING),
+        },
+        "단기급등(5일)": {
+            "triggered": cond_5d,
+            "target_price": close.shift(5) * (1 + THRESH_5D_WARNING),
+        },
+        "중장기급등(15일)": {
+            "triggered": cond_15d,
+            "target_price": close.shift(15) * (1 + THRESH_15D_WARNING),
+        },
+    }
+    return cond_3d | cond_5d | cond_15d, signals
+
+
+def check_warning_history(df):
+    """
+    Full-history mode of check_warning: evaluates every row in one vectorized pass.
+
+    df: calculate_indicators 결과 DataFrame.
+    Returns: DataFrame(index=df.index) - "triggered", 조건별 bool 컬럼, "<조건명>:target_price" 컬럼
+    """
+    df = as_pandas(df)
+    triggered, signals = warning_signals(df)
+    return signals_to_frame(triggered, signals, df.index)
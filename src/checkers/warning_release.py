@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
@@ -65,6 +66,60 @@ def check_release_conditions(df: pd.DataFrame, target_idx: int):
     
     return can_release, details
 
+def compute_release_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized check_release_conditions for every trading day in one pass.
+
+    Columns: close, thresh_5d, thresh_15d, prev_14_max, release_ceiling,
+             fail_5d, fail_15d, fail_highest, can_release
+    행 i 의 값은 check_release_conditions(df, i) 와 같습니다 (i < 15 는 can_release=False).
+    """
+    close = df['Close'].astype(float)
+    thresh_5d = close.shift(5) * 1.6
+    thresh_15d = close.shift(15) * 2.0
+    # T-14 ~ T-1 최고가 / T-14 ~ T 최고가
+    prev_14_max = close.shift(1).rolling(window=14).max()
+    max_15 = np.fmax(prev_14_max, close)
+
+    fail_5d = close >= thresh_5d
+    fail_15d = close >= thresh_15d
+    fail_highest = close >= max_15
+    enough = np.arange(len(df)) >= 15
+
+    return pd.DataFrame(
+        {
+            "close": df['Close'],
+            "thresh_5d": thresh_5d,
+            "thresh_15d": thresh_15d,
+            "prev_14_max": prev_14_max,
+            "release_ceiling": np.minimum(np.minimum(thresh_5d, thresh_15d), prev_14_max),
+            "fail_5d": fail_5d,
+            "fail_15d": fail_15d,
+            "fail_highest": fail_highest,
+            "can_release": enough & ~(fail_5d | fail_15d | fail_highest),
+        },
+        index=df.index,
+    )
+
+
+def _release_details(index: pd.DatetimeIndex, cols: dict, i: int):
+    if i < 15:
+        return None
+    return {
+        "date": index[i].strftime('%Y-%m-%d'),
+        "close": cols["close"][i],
+        "release_ceiling": cols["release_ceiling"][i],
+        "thresh_5d": cols["thresh_5d"][i],
+        "thresh_15d": cols["thresh_15d"][i],
+        "prev_14_max": cols["prev_14_max"][i],
+        "fails": {
+            "5d_60%": bool(cols["fail_5d"][i]),
+            "15d_100%": bool(cols["fail_15d"][i]),
+            "highest": bool(cols["fail_highest"][i]),
+        },
+    }
+
+
 def get_release_schedule(df: pd.DataFrame, designation_date_str: str):
     """
     Calculates the release schedule starting from T+10 trading days.
@@ -91,16 +146,17 @@ def get_release_schedule(df: pd.DataFrame, designation_date_str: str):
                 "message": "최초 판단일(T+10)에 아직 도달하지 않았습니다."
             }
             
-        results = []
+        # 판단일(T+10)부터 모든 날의 해제 요건을 한 번에 계산하고, 첫 해제일을 argmax 로 찾음
+        frame = compute_release_frame(df)
+        can_release = frame["can_release"].to_numpy(dtype=bool)[determination_start_idx:]
         released_date = None
-        
-        # Check from determination_start_idx to today
-        for i in range(determination_start_idx, len(df)):
-            can_release, details = check_release_conditions(df, i)
-            results.append(details)
-            if can_release:
-                released_date = df.index[i].strftime('%Y-%m-%d')
-                break
+        end_idx = len(df)
+        if can_release.any():
+            end_idx = determination_start_idx + int(can_release.argmax()) + 1
+            released_date = df.index[end_idx - 1].strftime('%Y-%m-%d')
+
+        cols = {c: frame[c].to_numpy() for c in frame.columns}
+        results = [_release_details(df.index, cols, i) for i in range(determination_start_idx, end_idx)]
         
         return {
             "status": "released" if released_date else "pending",
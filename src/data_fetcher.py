@@ -1,86 +1,152 @@
-import FinanceDataReader as fdr
+import os
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Optional
-import yfinance as yf
-import requests
-from bs4 import BeautifulSoup
-import time
+
+from src.cache import SingleFlight, TTLCache
+from src.providers import get_providers
+from src.store import get_store
+
+# 종목명은 거의 바뀌지 않으므로 하루 동안 캐시. 찾지 못한 경우(None)는 짧게만 캐시.
+_NAME_TTL = float(os.getenv("STOCK_NAME_TTL", "86400"))
+_NAME_NEGATIVE_TTL = 300.0
+_name_cache = TTLCache(maxsize=4096, ttl=_NAME_TTL)
+_name_flight = SingleFlight()
+_NOT_FOUND = object()
+
 
 def get_stock_name(code: str) -> Optional[str]:
     """
     Fetches Korean stock name from various sources.
     Returns None if not found.
+
+    결과는 프로세스 내 TTL/LRU 캐시에 보관되며, 같은 종목에 대한 동시 요청은
+    한 번의 원격 조회로 합쳐집니다.
     """
-    # Method 1: Try 네이버 증권 페이지 스크래핑
-    try:
-        url = f"https://finance.naver.com/item/main.naver?code={code}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            # 네이버 증권 페이지에서 종목명 추출
-            title_tag = soup.find('title')
-            if title_tag:
-                title = title_tag.get_text()
-                # "삼성전자 : 네이버 증권" 형식에서 종목명 추출
-                if ':' in title:
-                    name = title.split(':')[0].strip()
-                    if name and len(name) > 0:
-                        return name
-            # 또는 다른 선택자 시도
-            wrap_company = soup.find('div', class_='wrap_company')
-            if wrap_company:
-                h2 = wrap_company.find('h2')
-                if h2:
-                    name = h2.get_text().strip()
-                    if name:
-                        return name
-    except Exception:
-        pass
-    
-    # Method 2: Try FinanceDataReader StockListing with retry
-    for market in ['KRX', 'KRX-MARCAP']:
-        try:
-            df_krx = fdr.StockListing(market)
-            if df_krx is not None and not df_krx.empty:
-                match = df_krx[df_krx['Code'] == code]
-                if not match.empty:
-                    name = match.iloc[0].get('Name', None)
-                    if name:
-                        return name
-            time.sleep(0.5)  # Rate limiting
-        except Exception:
-            continue
-    
-    # Method 3: Fallback to yfinance (English name)
-    try:
-        ticker = yf.Ticker(f"{code}.KS")
-        info = ticker.info
-        if info and 'longName' in info:
-            return info['longName']
-        if info and 'shortName' in info:
-            return info['shortName']
-    except Exception:
-        pass
-    
-    return None
-
-def get_stock_data(code, days=120):
+    cached = _name_cache.get(code)
+    if cached is not None:
+        return None if cached is _NOT_FOUND else cached
+
+    def load():
+        # 대기 중이던 다른 호출이 이미 채웠을 수 있음
+        hit = _name_cache.get(code)
+        if hit is not None:
+            return None if hit is _NOT_FOUND else hit
+        name = _lookup_stock_name(code)
+        if name is None:
+            _name_cache.set(code, _NOT_FOUND, ttl=_NAME_NEGATIVE_TTL)
+        else:
+            _name_cache.set(code, name)
+        return name
+
+    return _name_flight.do(code, load)
+
+
+def _lookup_stock_name(code: str) -> Optional[str]:
+    # 상장 목록 → 네이버 → yfinance 순 (STOCK_NAME_PROVIDERS 로 변경 가능)
+    return get_providers().get_name(code)
+
+
+def get_stock_data(code, days=120, use_store=True, end=None):
     """
     Fetches OHLCV data for the given stock code.
     Fetches enough data to calculate moving averages (approx 120 days).
+
+    - end: 기준일(YYYY-MM-DD 또는 datetime). 주어지면 end 이하의 `days` 일 구간만 돌려줍니다.
+
+    로컬 저장소(src.store)를 먼저 읽고, 부족한 구간만 원격에서 받아 합칩니다.
+    - 최근 구간: 마지막 top-up 이후 STOCK_STORE_MAX_AGE 초가 지나지 않았다면 원격 조회를 생략
+    - 과거 구간(end < 오늘): 이미 저장된 확정 봉이면 원격 조회 없이 이분 탐색으로 잘라서 반환
+    - 저장된 시작일보다 앞 구간이 필요하면 그 부분만 받아 앞에 붙임
+    - 저장된 구간과 떨어진 과거 구간은 그 구간만 받아 반환 (저장하지 않음)
+    """
+    today = pd.Timestamp(datetime.today().date())
+    end_ts = min(pd.Timestamp(end).normalize(), today) if end is not None else today
+    start = end_ts - timedelta(days=days)
+    historical = end_ts < today
+
+    if not use_store:
+        df = _fetch_ohlcv(code, start, end_ts if historical else datetime.today())
+        return _slice(df, start, end_ts)
+
+    store = get_store()
+
+    def usable(raw):
+        return store.covers(raw, start, end_ts) if historical else store.is_fresh(raw, start)
+
+    raw = store.read_raw(code)
+    if usable(raw):
+        return store.read(code, start, end_ts, raw=raw)
+
+    with store.lock(code):
+        # 다른 워커가 lock 대기 중에 이미 받아 두었을 수 있음
+        raw = store.read_raw(code)
+        if usable(raw):
+            return store.read(code, start, end_ts, raw=raw)
+
+        cached = store.read(code, raw=raw)
+        if cached is None or cached.empty:
+            fresh = _fetch_ohlcv(code, start, end_ts if historical else datetime.today())
+            if fresh is None or fresh.empty:
+                return fresh
+            store.write(code, fresh, start, **_write_kwargs(historical, None, end_ts))
+            return store.read(code, start, end_ts)
+
+        if historical and end_ts < cached.index[0] - timedelta(days=1):
+            # 요청 구간이 저장된 구간보다 완전히 앞(사이에 빈 구간)이면 요청 구간만 받음.
+            # 저장소는 covered_from 부터 이어진 구간만 보관하므로 저장하지 않음
+            return _slice(_fetch_ohlcv(code, start, end_ts), start, end_ts)
+
+        merged, covered_from, changed = cached, raw["covered_from"], False
+        written = {"updated_at": raw["updated_at"], "final_through": pd.Timestamp(store.final_day(raw), unit="D")}
+
+        if covered_from > start:
+            # 저장된 구간보다 앞쪽만 받아서 붙임 (위에서 걸렀으므로 요청 구간 안쪽만큼)
+            head = _fetch_ohlcv(code, start, cached.index[0] - timedelta(days=1))
+            if head is not None:
+                merged = pd.concat([head, merged]) if not head.empty else merged
+                covered_from, changed = start, True
+
+        if not (store.covers(raw, cached.index[0], end_ts) if historical else store.is_fresh(raw, raw["covered_from"])):
+            # 마지막 봉은 장중에 받은 미완성 봉일 수 있으므로 다시 받음
+            fetch_from = cached.index[-1]
+            tail = _fetch_ohlcv(code, fetch_from, end_ts if historical else datetime.today())
+            # 원격 실패 시(None) 오래된 데이터라도 있으면 사용
+            if tail is not None:
+                if not tail.empty:
+                    merged = pd.concat([merged[merged.index < fetch_from], tail])
+                written, changed = _write_kwargs(historical, raw, end_ts), True
+
+        if not changed:
+            return _slice(merged, start, end_ts)
+        store.write(code, merged, covered_from, **written)
+
+    return store.read(code, start, end_ts)
+
+
+def _write_kwargs(historical, raw, end_ts):
+    """
+    store.write 인자: 오늘까지 받았으면 기본값(지금 갱신), 과거 구간(end_ts 까지)만 받았으면
+    이전 updated_at 을 유지해 최근 구간의 신선도 판단(is_fresh)에 영향을 주지 않습니다.
+    """
+    if not historical:
+        return {}
+    return {"updated_at": raw["updated_at"] if raw is not None else 0.0, "final_through": end_ts}
+
+
+def _fetch_ohlcv(code, start_date, end_date):
+    """
+    Remote OHLCV via the provider chain (fdr → yfinance 기본). 모든 공급원 실패 시 None.
     """
-    end_date = datetime.today()
-    start_date = end_date - timedelta(days=days)
-    
-    # fdr uses 'code' which can be KRX stock code
-    # e.g. '005930' for Samsung Electronics
-    try:
-        df = fdr.DataReader(code, start_date, end_date)
+    df = get_providers().get_ohlcv(code, start_date, end_date)
+    if df is None:
+        print(f"Error fetching data for {code}: all providers failed")
+    return df
+
+
+def _slice(df, start, end):
+    if df is None or df.empty:
         return df
-    except Exception as e:
-        print(f"Error fetching data for {code}: {e}")
-        return None
+    lo = df.index.searchsorted(pd.Timestamp(start), side="left")
+    hi = df.index.searchsorted(pd.Timestamp(end) + timedelta(days=1), side="left")
+    return df.iloc[lo:hi]
@@ -9,21 +9,34 @@ def calculate_indicators(df):
     if df is None or df.empty:
         return df
 
+    return _add_indicator_columns(df)
+
+
+def calculate_panel_indicators(panel):
+    """
+    Vectorized calculate_indicators over a whole universe at once.
+
+    panel: {'Open'|'High'|'Low'|'Close'|'Volume': DataFrame(bars x codes)} (src.screener.load_panel)
+    각 컬럼(종목)을 독립된 시계열로 보고 같은 지표를 계산해 panel 에 추가합니다.
+    """
+    if not panel or panel['Close'].empty:
+        return panel
+
+    return _add_indicator_columns(panel)
+
+
+def _add_indicator_columns(df):
+    """
+    Shared indicator formulas. `df` may be a DataFrame (one stock, columns=fields)
+    or a panel dict (field -> DataFrame of bars x codes); both support df['Close'].pct_change(...).
+    """
     # Closing Price Changes
     df['Change_1d'] = df['Close'].pct_change(periods=1)  # 전일 대비 변동률
     df['Change_3d'] = df['Close'].pct_change(periods=3)
     df['Change_5d'] = df['Close'].pct_change(periods=5)
     df['Change_15d'] = df['Close'].pct_change(periods=15)
-    
-    # 직전가격 대비 변동률 (종가급변종목용)
-    # 직전가격 = 전일 종가
-    df['Change_from_prev'] = df['Close'].pct_change(periods=1)
-    
-    # 종가 거래량 비율 (종가급변종목용)
-    # 종가 거래량은 OHLCV에서 정확히 구분할 수 없으므로, 
-    # 당일 거래량의 일부로 추정 (실제로는 종가 체결량이 필요)
-    # 여기서는 전체 거래량을 사용하되, 실제 구현 시 종가 거래량 데이터가 필요
-    df['Close_Vol_Ratio'] = 1.0  # Placeholder - 실제 종가 거래량 비율이 필요
+    # 직전가격(= 전일 종가) 대비 변동률은 Change_1d 를 그대로 사용 (종가급변종목용)
+    # 종가 거래량 비율은 OHLCV 로 알 수 없으므로 컬럼을 만들지 않음
     
     # Moving Averages
     df['MA_40'] = df['Close'].rolling(window=40).mean()
@@ -47,3 +60,90 @@ def calculate_indicators(df):
     df['Volatility_MA_40'] = df['Volatility'].rolling(window=40).mean()
     
     return df
+
+
+_BASE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+class IndicatorFrame:
+    """
+    Indicator result backed by a single contiguous 2D NumPy array (rows = bars, cols = fields).
+
+    - frame['Close'] 는 복사 없는 컬럼 view (ndarray)
+    - frame.latest() 는 마지막 봉을 {컬럼: float} dict 로 (한 번만 만들고 재사용)
+    DataFrame 과 달리 컬럼마다 객체를 두지 않고, df.iloc[-1] 처럼 mixed-dtype Series 를 만들지 않습니다.
+    """
+
+    __slots__ = ('values', 'index', 'columns', '_pos', '_latest')
+
+    def __init__(self, values, index, columns):
+        self.values = values
+        self.index = index
+        self.columns = tuple(columns)
+        self._pos = {c: i for i, c in enumerate(self.columns)}
+        self._latest = None
+
+    def __len__(self):
+        return self.values.shape[0]
+
+    def __contains__(self, name):
+        return name in self._pos
+
+    def __getitem__(self, name):
+        return self.values[:, self._pos[name]]
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    def latest(self):
+        if self._latest is None:
+            self._latest = dict(zip(self.columns, self.values[-1].tolist())) if len(self) else {}
+        return self._latest
+
+    def to_pandas(self):
+        return pd.DataFrame(self.values, index=self.index, columns=list(self.columns))
+
+
+def _rolling_mean(x, window):
+    out = np.full(len(x), np.nan, dtype=x.dtype)
+    if len(x) >= window:
+        out[window - 1:] = np.lib.stride_tricks.sliding_window_view(x, window).mean(axis=1)
+    return out
+
+
+def _pct_change(x, periods):
+    out = np.full(len(x), np.nan, dtype=x.dtype)
+    if len(x) > periods:
+        out[periods:] = x[periods:] / x[:-periods] - 1
+    return out
+
+
+def compute_indicator_frame(df, dtype=np.float64):
+    """
+    Same indicators as calculate_indicators, returned as an IndicatorFrame.
+
+    dtype=np.float32 로 주면 종목당 메모리를 절반으로 줄일 수 있습니다 (임계값 경계에서 미세한 반올림 차이 가능).
+    """
+    if df is None or df.empty:
+        return None
+
+    base = [c for c in _BASE_COLUMNS if c in df.columns]
+    columns = base + ['Change_1d', 'Change_3d', 'Change_5d', 'Change_15d', 'MA_40',
+                      'Vol_MA_40', 'Vol_Ratio', 'Volatility', 'Volatility_MA_40']
+
+    values = np.empty((len(df), len(columns)), dtype=dtype, order='F')
+    frame = IndicatorFrame(values, df.index, columns)
+    for c in base:
+        frame[c][:] = df[c].to_numpy(dtype=dtype)
+
+    close, high, low, volume = frame['Close'], frame['High'], frame['Low'], frame['Volume']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for k in (1, 3, 5, 15):
+            frame[f'Change_{k}d'][:] = _pct_change(close, k)
+        frame['MA_40'][:] = _rolling_mean(close, 40)
+        frame['Vol_MA_40'][:] = _rolling_mean(volume, 40)
+        frame['Vol_Ratio'][:] = volume / frame['Vol_MA_40']
+        frame['Volatility'][:] = (high - low) / close
+        frame['Volatility_MA_40'][:] = _rolling_mean(frame['Volatility'], 40)
+    return frame
@@ -0,0 +1,152 @@
+"""
+KRX listing index.
+
+상장 목록(공급원 체인의 get_listing, 기본 fdr.StockListing)을 하루에 한 번만 내려받아
+code -> (종목명, 시장, 상장주식수) dict 로 보관합니다. 디스크(.cache/listing/krx.json)에 저장하므로 재시작해도 다시 받지 않습니다.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+from src.store import cache_dir
+
+
+@dataclass(frozen=True)
+class ListingEntry:
+    code: str
+    name: str
+    market: Optional[str] = None
+    shares: Optional[int] = None  # 상장주식수
+
+
+class ListingIndex:
+    """
+    O(1) code -> ListingEntry lookup table.
+    """
+
+    def __init__(self, entries: dict[str, ListingEntry], as_of: str):
+        self.entries = entries
+        self.as_of = as_of
+
+    def get(self, code: str) -> Optional[ListingEntry]:
+        return self.entries.get(code)
+
+    def codes(self) -> list[str]:
+        return list(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def to_json(self) -> dict:
+        return {
+            "as_of": self.as_of,
+            "entries": {c: [e.name, e.market, e.shares] for c, e in self.entries.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "ListingIndex":
+        entries = {
+            code: ListingEntry(code, name, market, shares)
+            for code, (name, market, shares) in data["entries"].items()
+        }
+        return cls(entries, data["as_of"])
+
+
+def _download_listing() -> Optional[ListingIndex]:
+    """
+    Fetches the listing through the name-provider chain (기본: fdr.StockListing, local: listing.csv).
+    """
+    from src.providers import get_providers
+
+    df = get_providers().get_listing()
+    if df is None or df.empty:
+        return None
+
+    entries = {}
+    for code, name, mkt, sh in zip(df["code"].astype(str), df["name"], df["market"], df["shares"]):
+        if not isinstance(name, str) or not name:
+            continue
+        sh = int(sh) if sh is not None and sh == sh and sh > 0 else None  # NaN 제외
+        entries[code] = ListingEntry(code, name, mkt if isinstance(mkt, str) else None, sh)
+    return ListingIndex(entries, date.today().isoformat()) if entries else None
+
+
+_RETRY_INTERVAL = 600.0  # 원격 실패 후 재시도까지 대기(초)
+_index: Optional[ListingIndex] = None
+_last_attempt = 0.0
+_lock = threading.Lock()
+
+
+def _listing_path() -> Path:
+    # import 시점이 아니라 처음 읽고 쓸 때 캐시 디렉터리를 만듦
+    return cache_dir("listing") / "krx.json"
+
+
+def _read_persisted() -> Optional[ListingIndex]:
+    try:
+        with open(_listing_path(), encoding="utf-8") as f:
+            return ListingIndex.from_json(json.load(f))
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+
+def _persist(index: ListingIndex) -> None:
+    path = _listing_path()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(index.to_json(), f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _usable(today: str) -> bool:
+    # 오늘자이거나, 원격 실패 후 재시도 대기 중이면 (오래된 것이라도) 메모리의 목록을 그대로 사용
+    if _index is None:
+        return False
+    return _index.as_of == today or bool(_last_attempt) and time.monotonic() - _last_attempt < _RETRY_INTERVAL
+
+
+def get_listing_index(refresh: bool = False) -> Optional[ListingIndex]:
+    """
+    Returns the listing index, downloading at most once per day.
+
+    순서: 메모리 -> 디스크(오늘자) -> 원격. 원격 실패 시 오래된 디스크본이라도 사용.
+    디스크는 메모리에 목록이 없을 때만 읽습니다.
+    """
+    global _index, _last_attempt
+    today = date.today().isoformat()
+    if not refresh and _usable(today):
+        return _index
+
+    with _lock:
+        if not refresh and _usable(today):
+            return _index
+
+        if not refresh and _index is None:
+            _index = _read_persisted()
+            if _index is not None and _index.as_of == today:
+                return _index
+
+        if not refresh and _last_attempt and time.monotonic() - _last_attempt < _RETRY_INTERVAL:
+            return _index
+
+        _last_attempt = time.monotonic()
+        fresh = _download_listing()
+        if fresh is not None:
+            _persist(fresh)
+            _index = fresh
+        elif _index is None:
+            _index = _read_persisted()
+        return _index
+
+
+def get_listing_entry(code: str) -> Optional[ListingEntry]:
+    index = get_listing_index()
+    return index.get(code) if index is not None else None
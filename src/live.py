@@ -0,0 +1,319 @@
+"""
+Intraday live evaluation.
+
+완료된 일봉으로 기준값(T-1/T-3/T-5/T-15 종가, 최근 14일 최고가, 40일 합계 등)을 미리 계산해 두고,
+장중 현재가가 들어올 때마다 '오늘 봉'만 붙였다고 가정한 마지막 행 조건을 O(1) 로 다시 평가합니다.
+과거 구간의 지표를 다시 계산하지 않으므로 수천 종목을 몇 초 간격으로 재검사할 수 있습니다.
+
+현재가 공급원(PriceSource)은 교체 가능하며, 테스트/벤치마크에서는 StaticPriceSource 로 대체합니다.
+"""
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from datetime import date as date_cls, datetime
+from typing import Callable, Iterable, Optional, Protocol
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import requests
+
+from src.checkers import caution as ca
+from src.checkers import overheating as oh
+from src.checkers import warning as wa
+from src.data_fetcher import get_stock_data
+
+KST = ZoneInfo("Asia/Seoul")
+
+
+def today_kst() -> date_cls:
+    return datetime.now(KST).date()
+
+
+@dataclass(frozen=True)
+class Quote:
+    price: float
+    volume: float  # 당일 누적 거래량
+    high: Optional[float] = None  # 당일 고가
+    low: Optional[float] = None  # 당일 저가
+    # 시세의 거래일. 주말/휴장일에는 직전 거래일 종가가 오므로 오늘 날짜와 다를 수 있음 (None 이면 KST 오늘)
+    date: Optional[date_cls] = None
+
+
+class PriceSource(Protocol):
+    def get_quotes(self, codes: list[str]) -> dict[str, Quote]:
+        ...
+
+
+class StaticPriceSource:
+    """
+    In-memory feed: set quotes manually (tests, benchmarks, replay).
+    """
+
+    def __init__(self, quotes: Optional[dict[str, Quote]] = None):
+        self.quotes = dict(quotes or {})
+
+    def set(self, code: str, quote: Quote) -> None:
+        self.quotes[code] = quote
+
+    def get_quotes(self, codes: list[str]) -> dict[str, Quote]:
+        return {c: self.quotes[c] for c in codes if c in self.quotes}
+
+
+class NaverPriceSource:
+    """
+    네이버 증권 polling API 로 현재가를 조회합니다. (여러 종목을 한 번의 요청으로)
+    """
+
+    URL = "https://polling.finance.naver.com/api/realtime/domestic/stock/{codes}"
+
+    def __init__(self, timeout: float = 3.0, chunk: int = 50):
+        self.timeout = timeout
+        self.chunk = chunk
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "Mozilla/5.0"
+
+    @staticmethod
+    def _num(v) -> Optional[float]:
+        try:
+            return float(str(v).replace(",", ""))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _date(v) -> Optional[date_cls]:
+        # localTradedAt: "2026-10-16T15:30:00+09:00"
+        try:
+            return date_cls.fromisoformat(str(v)[:10])
+        except ValueError:
+            return None
+
+    def get_quotes(self, codes: list[str]) -> dict[str, Quote]:
+        quotes = {}
+        for i in range(0, len(codes), self.chunk):
+            batch = codes[i:i + self.chunk]
+            try:
+                resp = self.session.get(self.URL.format(codes=",".join(batch)), timeout=self.timeout)
+                resp.raise_for_status()
+                items = resp.json().get("datas", [])
+            except Exception as e:
+                print(f"Error fetching quotes: {e}")
+                continue
+            for item in items:
+                price = self._num(item.get("closePrice"))
+                if price is None:
+                    continue
+                quotes[str(item.get("itemCode"))] = Quote(
+                    price=price,
+                    volume=self._num(item.get("accumulatedTradingVolume")) or 0.0,
+                    high=self._num(item.get("highPrice")),
+                    low=self._num(item.get("lowPrice")),
+                    date=self._date(item.get("localTradedAt")),
+                )
+        return quotes
+
+
+@dataclass(frozen=True)
+class LiveBases:
+    """
+    Precomputed values from completed daily bars, relative to today's (live) bar.
+    """
+
+    code: str
+    base_date: pd.Timestamp  # 마지막 완료 봉 날짜
+    bars: int  # 오늘 봉을 포함한 봉 수
+    prev_close: float  # T-1
+    close_3: float  # T-3
+    close_5: float  # T-5
+    close_15: float  # T-15
+    prev_14_max: float  # T-14 ~ T-1 최고 종가
+    vol_prev_2: float  # T-2, T-1 거래량 합 (3일 평균용)
+    close_sum_39: float  # T-39 ~ T-1 종가 합 (MA_40)
+    vol_sum_39: float
+    volatility_sum_39: float
+
+    @classmethod
+    def from_frame(cls, code: str, df: pd.DataFrame) -> Optional["LiveBases"]:
+        """
+        df: 시세 거래일 이전의 완료된 일봉 (그 날짜 이후의 봉이 있으면 제외하고 넘겨주세요).
+        """
+        if df is None or df.empty:
+            return None
+        close = df["Close"].to_numpy(dtype=float)
+        volume = df["Volume"].to_numpy(dtype=float)
+        volatility = (df["High"].to_numpy(dtype=float) - df["Low"].to_numpy(dtype=float)) / close
+
+        def ago(x, k):
+            return float(x[-k]) if len(x) >= k else math.nan
+
+        def tail_sum(x, k):
+            return float(x[-k:].sum()) if len(x) >= k else math.nan
+
+        return cls(
+            code=code,
+            base_date=df.index[-1],
+            bars=len(df) + 1,
+            prev_close=ago(close, 1),
+            close_3=ago(close, 3),
+            close_5=ago(close, 5),
+            close_15=ago(close, 15),
+            prev_14_max=float(close[-14:].max()),
+            vol_prev_2=float(volume[-2:].sum()),
+            close_sum_39=tail_sum(close, 39),
+            vol_sum_39=tail_sum(volume, 39),
+            volatility_sum_39=tail_sum(volatility, 39),
+        )
+
+
+def _rule(triggered: bool, target_price: float, price: float) -> dict:
+    target = None if math.isnan(target_price) else target_price
+    return {
+        "triggered": bool(triggered),
+        "target_price": target,
+        "gap": (target / price - 1) if target is not None and price else None,
+    }
+
+
+def evaluate_live(bases: LiveBases, quote: Quote) -> dict:
+    """
+    Evaluates the latest-row conditions of check_caution / check_warning / check_overheating
+    as if `quote` were today's bar. Same results as running the checkers on the appended frame.
+    """
+    price, volume = float(quote.price), float(quote.volume)
+    high = quote.high if quote.high is not None else price
+    low = quote.low if quote.low is not None else price
+
+    def change(base):
+        return price / base - 1 if base == base and base else math.nan
+
+    change_1d, change_3d = change(bases.prev_close), change(bases.close_3)
+    change_5d, change_15d = change(bases.close_5), change(bases.close_15)
+
+    # 투자주의
+    caution_ok = bases.bars >= ca.MIN_BARS
+    recent_3d_vol = (bases.vol_prev_2 + volume) / 3
+    caution_rules = {
+        "소수계좌거래집중(3일)": _rule(
+            caution_ok and change_3d >= ca.THRESH_3D_CAUTION and recent_3d_vol >= ca.THRESH_3D_VOLUME,
+            bases.close_3 * (1 + ca.THRESH_3D_CAUTION), price,
+        ),
+        "종가급변종목": _rule(
+            caution_ok and abs(change_1d) >= ca.THRESH_CLOSE_CHANGE and volume >= ca.THRESH_TOTAL_VOLUME,
+            bases.prev_close * (1 + ca.THRESH_CLOSE_CHANGE), price,
+        ),
+        "15일간상승종목": _rule(
+            caution_ok and change_15d >= ca.THRESH_15D_CAUTION,
+            bases.close_15 * (1 + ca.THRESH_15D_CAUTION), price,
+        ),
+    }
+
+    # 투자경고 (최근 15일 종가 중 최고가일 때만)
+    at_max = bases.bars >= wa.MIN_BARS and price >= bases.prev_14_max
+    warning_rules = {
+        "초단기급등(3일)": _rule(at_max and change_3d >= wa.THRESH_3D_WARNING,
+                             bases.close_3 * (1 + wa.THRESH_3D_WARNING), price),
+        "단기급등(5일)": _rule(at_max and change_5d >= wa.THRESH_5D_WARNING,
+                           bases.close_5 * (1 + wa.THRESH_5D_WARNING), price),
+        "중장기급등(15일)": _rule(at_max and change_15d >= wa.THRESH_15D_WARNING,
+                             bases.close_15 * (1 + wa.THRESH_15D_WARNING), price),
+    }
+
+    # 단기과열
+    overheating_ok = bases.bars >= oh.MIN_BARS
+    ma_40 = (bases.close_sum_39 + price) / 40
+    vol_ma_40 = (bases.vol_sum_39 + volume) / 40
+    vol_ratio = volume / vol_ma_40 if vol_ma_40 else math.nan
+    volatility = (high - low) / price if price else math.nan
+    volatility_ma_40 = (bases.volatility_sum_39 + volatility) / 40
+    oh_price = overheating_ok and price >= ma_40 * oh.PRICE_MA_MULTIPLIER
+    oh_vol = overheating_ok and vol_ratio >= oh.VOL_RATIO_THRESHOLD
+    oh_volatility = overheating_ok and volatility >= volatility_ma_40 * oh.VOLATILITY_MA_MULTIPLIER
+
+    return {
+        "code": bases.code,
+        "price": price,
+        "volume": volume,
+        "caution": {
+            "triggered": any(r["triggered"] for r in caution_rules.values()),
+            "rules": caution_rules,
+        },
+        "warning": {
+            "triggered": any(r["triggered"] for r in warning_rules.values()),
+            "rules": warning_rules,
+        },
+        "overheating": {
+            "triggered": bool(oh_price and oh_vol and oh_volatility),
+            "rules": {
+                "주가요건": {"triggered": bool(oh_price), "threshold": ma_40 * oh.PRICE_MA_MULTIPLIER},
+                "회전율요건": {"triggered": bool(oh_vol), "val": vol_ratio, "threshold": oh.VOL_RATIO_THRESHOLD},
+                "변동성요건": {"triggered": bool(oh_volatility), "val": volatility,
+                          "threshold": volatility_ma_40 * oh.VOLATILITY_MA_MULTIPLIER},
+            },
+        },
+    }
+
+
+class LiveMonitor:
+    """
+    Keeps LiveBases for a set of watched codes and re-evaluates them from a PriceSource.
+    """
+
+    def __init__(self, source: PriceSource, loader: Callable[[str], Optional[pd.DataFrame]] = get_stock_data):
+        self.source = source
+        self.loader = loader
+        self.bases: dict[str, LiveBases] = {}
+        self._as_of: dict[str, date_cls] = {}  # 종목별 기준값을 만든 시세 거래일
+
+    def _load(self, code: str, as_of: date_cls) -> None:
+        df = self.loader(code)
+        if df is None or df.empty:
+            return
+        # as_of 당일(장중) 봉과 그 이후 봉은 제외 — 시세가 그 날짜의 봉 역할을 함
+        df = df[df.index.normalize() < pd.Timestamp(as_of)]
+        bases = LiveBases.from_frame(code, df)
+        if bases is not None:
+            self.bases[code] = bases
+            self._as_of[code] = as_of
+
+    def watch(self, codes: Iterable[str], as_of: Optional[date_cls] = None) -> None:
+        """
+        Loads (or reloads) bases for the given codes from daily bars before `as_of` (기본: KST 오늘).
+        """
+        as_of = as_of or today_kst()
+        for code in codes:
+            self._load(code, as_of)
+
+    def unwatch(self, codes: Iterable[str]) -> None:
+        for code in codes:
+            self.bases.pop(code, None)
+            self._as_of.pop(code, None)
+
+    def poll_once(self) -> dict[str, dict]:
+        quotes = self.source.get_quotes(list(self.bases))
+        results = {}
+        for code, quote in quotes.items():
+            if code not in self.bases:
+                continue
+            day = quote.date or today_kst()
+            # 날짜가 바뀌었거나(어제 봉이 완료 봉이 됨) 주말/휴장일에 직전 거래일 시세가 온 경우
+            # 시세 거래일 기준으로 기준값을 다시 계산
+            if self._as_of.get(code) != day:
+                self._load(code, day)
+            bases = self.bases.get(code)
+            # 시세가 이미 완료 봉에 포함된 날짜면 '오늘 봉'으로 다시 붙이지 않음
+            if bases is None or day <= bases.base_date.date():
+                continue
+            results[code] = evaluate_live(bases, quote)
+        return results
+
+    def run(self, interval: float, callback: Callable[[dict[str, dict]], None], iterations: Optional[int] = None) -> None:
+        """
+        Polls every `interval` seconds and passes each batch of results to `callback`.
+        """
+        n = 0
+        while iterations is None or n < iterations:
+            started = time.monotonic()
+            callback(self.poll_once())
+            n += 1
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
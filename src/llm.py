@@ -0,0 +1,188 @@
+"""
+LLM clients and a content-addressed cache for generated posts.
+
+- LLMClient: 교체 가능한 생성기 (GeminiClient / 테스트용 StubLLMClient, LLM_PROVIDER 로 선택)
+- GenerationCache: sha256(model, prompt, data_context) 를 key 로 생성 결과(JSON)를 디스크에 보관
+  TTL 과 전체 용량 제한(오래 쓰지 않은 항목부터 삭제)이 있으며, 발행 여부를 함께 기록해
+  발행에 실패한 글은 다시 생성하지 않고 캐시된 JSON 으로 재발행할 수 있습니다.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Protocol
+
+from src.store import cache_dir
+
+_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(3 * 86400)))
+_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+
+class LLMClient(Protocol):
+    model: str
+
+    def generate_json(self, prompt: str) -> dict[str, Any]:
+        ...
+
+
+class GeminiClient:
+    def __init__(self, model: str = "gemini-flash-latest", api_key: Optional[str] = None):
+        import google.generativeai as genai
+
+        self.model = model
+        genai.configure(api_key=api_key or os.getenv("GEMINI_API_KEY"))
+        self._model = genai.GenerativeModel(model)
+
+    def generate_json(self, prompt: str) -> dict[str, Any]:
+        response = self._model.generate_content(prompt, generation_config={"response_mime_type": "application/json"})
+        return json.loads(response.text)
+
+
+class StubLLMClient:
+    """
+    Local stand-in for tests and dry runs: returns a fixed post (or `fn(prompt)`), counting calls.
+    """
+
+    model = "stub"
+
+    def __init__(self, fn: Optional[Callable[[str], dict[str, Any]]] = None, delay: float = 0.0):
+        self.fn = fn
+        self.delay = delay
+        self.calls = 0
+
+    def generate_json(self, prompt: str) -> dict[str, Any]:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fn is not None:
+            return self.fn(prompt)
+        digest = hashlib.sha256(prompt.encode()).hexdigest()[:8]
+        return {
+            "title": f"Stub post {digest}",
+            "content": "<p>stub content</p>",
+            "meta_description": "stub",
+            "tags": ["stub"],
+        }
+
+
+def get_llm_client() -> Optional[LLMClient]:
+    """
+    LLM_PROVIDER=gemini (기본, GEMINI_API_KEY 필요) | stub
+    """
+    provider = os.getenv("LLM_PROVIDER", "gemini").strip().lower()
+    if provider == "stub":
+        return StubLLMClient()
+    if not os.getenv("GEMINI_API_KEY"):
+        return None
+    return GeminiClient(os.getenv("GEMINI_MODEL", "gemini-flash-latest"))
+
+
+def generation_key(model: str, prompt: str, data_context: str) -> str:
+    h = hashlib.sha256()
+    for part in (model, prompt, data_context):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class GenerationCache:
+    """
+    <root>/<key>.json: {"created_at", "model", "published", "result"}
+    """
+
+    def __init__(self, root: Optional[Path] = None, ttl: float = _CACHE_TTL, max_bytes: int = _CACHE_MAX_BYTES):
+        self.root = Path(root) if root is not None else cache_dir("llm")
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _read(self, path: Path) -> Optional[dict]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if time.time() - entry.get("created_at", 0) >= self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def _write(self, key: str, entry: dict) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, self._path(key))
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        entry = self._read(path)
+        if entry is not None:
+            os.utime(path)  # 최근 사용 시각 (용량 초과 시 삭제 순서)
+        return entry
+
+    def put(self, key: str, model: str, result: dict[str, Any]) -> None:
+        with self._lock:
+            self._write(key, {"created_at": time.time(), "model": model, "published": False, "result": result})
+            self._evict()
+
+    def update(self, key: str, result: Optional[dict[str, Any]] = None, published: Optional[bool] = None) -> None:
+        with self._lock:
+            entry = self._read(self._path(key))
+            if entry is None:
+                return
+            if result is not None:
+                entry["result"] = result
+            if published is not None:
+                entry["published"] = published
+            self._write(key, entry)
+
+    def pending(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        """
+        (key, result) of cached generations that were never published, oldest first.
+        stub 모델 결과는 실제 글이 아니므로 재발행 대상에서 제외합니다.
+        """
+        paths = sorted(self.root.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for path in paths:
+            entry = self._read(path)
+            if entry is not None and not entry.get("published") and entry.get("model") != StubLLMClient.model:
+                yield path.stem, entry["result"]
+
+    def _evict(self) -> None:
+        files = [(p, p.stat()) for p in self.root.glob("*.json")]
+        total = sum(st.st_size for _, st in files)
+        for path, st in sorted(files, key=lambda x: x[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= st.st_size
+
+
+def generate_cached(
+    client: LLMClient,
+    prompt: str,
+    data_context: str,
+    cache: Optional[GenerationCache] = None,
+    store: bool = True,
+) -> tuple[str, dict[str, Any], bool]:
+    """
+    Returns (key, result, cache_hit). 같은 (model, prompt, data_context) 는 다시 생성하지 않습니다.
+    store=False (dry run): 캐시를 읽기만 하고 새 결과는 저장하지 않음 (발행 대기 항목이 생기지 않도록)
+    """
+    key = generation_key(client.model, prompt, data_context)
+    if cache is not None:
+        entry = cache.get(key)
+        if entry is not None:
+            return key, entry["result"], True
+    result = client.generate_json(prompt)
+    if cache is not None and store:
+        cache.put(key, client.model, result)
+    return key, result, False
@@ -0,0 +1,226 @@
+"""
+Market index snapshot.
+
+설정된 지수(나스닥, 다우, S&P 500, 코스피, 코스닥)를 yfinance 한 번의 일괄 다운로드로 받아
+종가/전일 대비/등락률을 벡터 연산으로 계산합니다.
+
+결과는 거래일(session) 단위로 .cache/market/<session>.json 에 저장되어,
+같은 거래일 안에서는 main.py 재실행이나 API 요청이 다시 다운로드하지 않습니다.
+session 은 시장별 "마지막으로 종가가 확정된 거래일" 조합(예: KR2026-10-16_US2026-10-16)이므로
+어느 한 시장이라도 새 종가가 확정되면 자동으로 새로 받습니다.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from pathlib import Path
+from typing import Any, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from src.cache import SingleFlight
+from src.store import cache_dir
+
+# ticker -> (표시 이름, 시장)
+INDICES: dict[str, tuple[str, str]] = {
+    "^IXIC": ("Nasdaq Composite", "US"),
+    "^DJI": ("Dow Jones", "US"),
+    "^GSPC": ("S&P 500", "US"),
+    "^KS11": ("KOSPI", "KR"),
+    "^KQ11": ("KOSDAQ", "KR"),
+}
+
+# 시장별 시간대와 종가가 데이터 제공처에 반영되는 시각 (장 마감 후 여유 포함)
+MARKETS: dict[str, tuple[ZoneInfo, dt_time]] = {
+    "US": (ZoneInfo("America/New_York"), dt_time(16, 30)),
+    "KR": (ZoneInfo("Asia/Seoul"), dt_time(16, 0)),
+}
+
+_DOWNLOAD_TIMEOUT = float(os.getenv("MARKET_DOWNLOAD_TIMEOUT", "15"))
+_PARTIAL_TTL = float(os.getenv("MARKET_PARTIAL_TTL", "60"))
+
+
+def settled_day(market: str, now: Optional[datetime] = None) -> date:
+    """
+    Last weekday whose close is settled for `market` at `now` (공휴일은 고려하지 않음).
+    """
+    tz, settled = MARKETS[market]
+    local = (now or datetime.now(tz)).astimezone(tz)
+    day = local.date() if local.time() >= settled else local.date() - timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def session_key(now: Optional[datetime] = None) -> str:
+    return "_".join(f"{m}{settled_day(m, now).isoformat()}" for m in sorted(MARKETS))
+
+
+def compute_snapshot(frame: pd.DataFrame, now: Optional[datetime] = None) -> dict[str, dict[str, Any]]:
+    """
+    frame: yf.download(group_by="column") 결과 (columns: (field, ticker)).
+    시장마다 휴장일이 달라 NaN 이 섞여 있으므로 지수별로 마지막 유효 봉과 그 직전 봉을 비교합니다.
+    장중에는 오늘 봉이 아직 확정되지 않았으므로 시장별 settled_day 이후의 봉은 제외합니다.
+    """
+    if frame is None or frame.empty:
+        return {}
+    close = frame["Close"]
+    tickers = list(close.columns)
+    values = close.to_numpy(dtype=float)
+    n, cols = len(values), np.arange(len(tickers))
+
+    index = pd.DatetimeIndex(close.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    days = index.values.astype("datetime64[D]")
+    settled = {m: np.datetime64(settled_day(m, now), "D") for m in MARKETS}
+    cutoff = np.array([settled.get(INDICES.get(t, (t, None))[1], np.datetime64("NaT")) for t in tickers],
+                      dtype="datetime64[D]")
+    # 시장을 모르는 ticker(NaT)는 잘라내지 않음
+    valid = ~np.isnan(values) & ((days[:, None] <= cutoff[None, :]) | np.isnat(cutoff)[None, :])
+
+    has_last = valid.any(axis=0)
+    last = n - 1 - valid[::-1].argmax(axis=0)
+    valid[last, cols] = False
+    has_prev = has_last & valid.any(axis=0)
+    prev = np.where(has_prev, n - 1 - valid[::-1].argmax(axis=0), last)
+
+    def take(field: str) -> np.ndarray:
+        return frame[field][tickers].to_numpy(dtype=float)[last, cols]
+
+    last_close = values[last, cols]
+    prev_close = values[prev, cols]
+    change = last_close - prev_close
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_percent = np.where(prev_close != 0, change / prev_close * 100, 0.0)
+    dates = index[last].strftime("%Y-%m-%d")
+    ohlv = {f.lower(): np.round(take(f), 2) for f in ("Open", "High", "Low")}
+    volume = np.nan_to_num(take("Volume"))
+
+    snapshot = {}
+    for i, ticker in enumerate(tickers):
+        if not has_last[i]:
+            continue
+        name, market = INDICES.get(ticker, (ticker, None))
+        snapshot[ticker] = {
+            "name": name,
+            "market": market,
+            "date": dates[i],
+            "close": round(float(last_close[i]), 2),
+            "open": float(ohlv["open"][i]),
+            "high": float(ohlv["high"][i]),
+            "low": float(ohlv["low"][i]),
+            "volume": int(volume[i]),
+            "change": round(float(change[i]), 2),
+            "change_percent": round(float(change_percent[i]), 2),
+        }
+    return snapshot
+
+
+def download_indices(tickers: list[str]) -> pd.DataFrame:
+    """
+    One batched request for every ticker (지수별 history() 호출 대신).
+    """
+    import yfinance as yf
+
+    return yf.download(
+        tickers,
+        period="10d",  # 연휴가 있어도 직전 거래일이 포함되도록
+        group_by="column",
+        auto_adjust=False,
+        progress=False,
+        threads=True,
+        timeout=_DOWNLOAD_TIMEOUT,
+    )
+
+
+class MarketSnapshotCache:
+    """
+    <root>/<session>.json: {"session", "fetched_at", "indices": {ticker: {...}}}
+    메모리에 마지막 스냅샷을 두고, 동시에 들어온 요청은 한 번만 다운로드합니다.
+    일부 지수만 받은 결과는 디스크에 저장하지 않고 메모리에만 partial_ttl 초 동안 둡니다.
+    """
+
+    def __init__(self, root=None, tickers: Optional[list[str]] = None, keep: int = 10,
+                 partial_ttl: float = _PARTIAL_TTL):
+        self.root = cache_dir("market") if root is None else Path(root)
+        self.tickers = list(tickers or INDICES)
+        self.keep = keep
+        self.partial_ttl = partial_ttl
+        self._memory: Optional[dict] = None
+        self._memory_expires = 0.0
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def _path(self, session: str) -> Path:
+        return self.root / f"{session}.json"
+
+    def _load(self, session: str) -> Optional[dict]:
+        try:
+            with open(self._path(session), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _save(self, entry: dict) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, self._path(entry["session"]))
+        for old in sorted(self.root.glob("*.json"))[:-self.keep]:
+            old.unlink(missing_ok=True)
+
+    def _fetch(self, session: str, now: Optional[datetime] = None) -> dict:
+        indices = compute_snapshot(download_indices(self.tickers), now)
+        entry = {"session": session, "fetched_at": datetime.now().timestamp(), "indices": indices}
+        if len(indices) == len(self.tickers):
+            self._save(entry)  # 일부만 받은 결과는 디스크에 남기지 않음 (다음 실행에서 다시 시도)
+        return entry
+
+    def get(self, now: Optional[datetime] = None, refresh: bool = False) -> dict:
+        session = session_key(now)
+        with self._lock:
+            memory, expires = self._memory, self._memory_expires
+        if not refresh and memory is not None and memory["session"] == session and time.monotonic() < expires:
+            return memory
+        entry = None if refresh else self._load(session)
+        if entry is None:
+            entry = self._flight.do(session, lambda: self._fetch(session, now))
+        complete = len(entry["indices"]) == len(self.tickers)
+        with self._lock:
+            self._memory = entry
+            # 완전한 스냅샷은 session 이 바뀔 때까지, 일부만 받은 것은 잠시 후 다시 시도
+            self._memory_expires = float("inf") if complete else time.monotonic() + self.partial_ttl
+        return entry
+
+
+_default_cache: Optional[MarketSnapshotCache] = None
+_default_lock = threading.Lock()
+
+
+def get_market_snapshot(
+    tickers: Optional[list[str]] = None,
+    refresh: bool = False,
+) -> dict[str, dict[str, Any]]:
+    """
+    {ticker: {name, market, date, close, open, high, low, volume, change, change_percent}}
+    tickers 를 주면 그 지수만 (다운로드는 항상 전체 INDICES 를 한 번에).
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = MarketSnapshotCache()
+    try:
+        indices = _default_cache.get(refresh=refresh)["indices"]
+    except Exception as e:
+        print(f"Error fetching market snapshot: {e}")
+        return {}
+    if tickers is None:
+        return indices
+    return {t: indices[t] for t in tickers if t in indices}
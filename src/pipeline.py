@@ -0,0 +1,153 @@
+"""
+Multi-post publishing pipeline.
+
+한 번 실행에 여러 글(미국 지수, 한국 지수, 뉴스 요약, 종목별 투자경고 watch 등)을 만듭니다.
+단계(stage)는 서로 독립적으로 겹쳐서 진행됩니다.
+
+    gather (스레드 풀, 동시 조회)  →  generate (동시 실행 수 제한, LLM)  →  publish (큐, 순차 발행)
+
+각 글의 단계별 소요 시간을 기록해 실행이 끝나면 표로 출력합니다.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from tabulate import tabulate
+
+
+@dataclass
+class PostJob:
+    key: str  # 예: "us_indices", "watch:005930"
+    topic: str  # LLM 프롬프트의 주제
+    category: Optional[str]  # 워드프레스 카테고리 이름
+    gather: Callable[[], Optional[str]]  # data_context 를 만들어 반환 (None 이면 이번 실행에서 건너뜀)
+
+
+@dataclass
+class JobResult:
+    key: str
+    status: str = "pending"  # skipped / failed / published / dry-run
+    title: Optional[str] = None
+    error: Optional[str] = None
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+class _Timer:
+    def __init__(self, result: JobResult, stage: str):
+        self.result, self.stage = result, stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.result.timings[self.stage] = time.perf_counter() - self.started
+        return False
+
+
+def run_pipeline(
+    jobs: list[PostJob],
+    generate: Callable[[str, str], Optional[dict[str, Any]]],
+    publish: Callable[[dict[str, Any]], bool],
+    resolve_category: Optional[Callable[[str], Optional[int]]] = None,
+    fetch_workers: int = 8,
+    llm_concurrency: int = 2,
+    dry_run: bool = False,
+) -> list[JobResult]:
+    """
+    Runs every job through gather → generate → publish.
+
+    - generate(topic, data_context) -> 생성된 글 dict (title/content/meta_description/tags) 또는 None
+    - publish(post) -> 성공 여부. 하나의 발행 스레드가 큐에서 꺼내 순서대로 발행합니다.
+    - dry_run: 발행하지 않고 생성까지만 실행
+    """
+    results = {job.key: JobResult(job.key) for job in jobs}
+    publish_queue: queue.Queue = queue.Queue()
+    _DONE = object()
+
+    def publisher():
+        while True:
+            item = publish_queue.get()
+            if item is _DONE:
+                return
+            job, post = item
+            result = results[job.key]
+            with _Timer(result, "publish"):
+                try:
+                    ok = publish(post)
+                except Exception as e:
+                    ok, result.error = False, str(e)
+            result.status = "published" if ok else "failed"
+
+    def generate_stage(job: PostJob, data_context: str, category_id: Optional[int]) -> None:
+        result = results[job.key]
+        with _Timer(result, "generate"):
+            try:
+                post = generate(job.topic, data_context)
+            except Exception as e:
+                post, result.error = None, str(e)
+        if not post:
+            result.status = "failed"
+            result.error = result.error or "generation failed"
+            return
+        result.title = post.get("title")
+        if category_id:
+            post["category_ids"] = [category_id]
+        if dry_run:
+            result.status = "dry-run"
+        else:
+            publish_queue.put((job, post))
+
+    publisher_thread = threading.Thread(target=publisher, name="publisher", daemon=True)
+    publisher_thread.start()
+
+    with ThreadPoolExecutor(max_workers=max(1, fetch_workers), thread_name_prefix="gather") as gather_pool, \
+            ThreadPoolExecutor(max_workers=max(1, llm_concurrency), thread_name_prefix="llm") as llm_pool:
+        # 카테고리 ID 는 글마다가 아니라 이름별로 한 번만, 데이터 수집과 동시에 조회
+        categories = sorted({job.category for job in jobs if job.category})
+        category_futures = {
+            name: gather_pool.submit(resolve_category, name) if resolve_category and not dry_run else None
+            for name in categories
+        }
+
+        def gather_stage(job: PostJob) -> None:
+            result = results[job.key]
+            with _Timer(result, "gather"):
+                try:
+                    data_context = job.gather()
+                except Exception as e:
+                    data_context, result.error = None, str(e)
+            if not data_context:
+                result.status = "failed" if result.error else "skipped"
+                return
+            future = category_futures.get(job.category)
+            try:
+                category_id = future.result() if future is not None else None
+            except Exception:
+                category_id = None
+            llm_pool.submit(generate_stage, job, data_context, category_id)
+
+        for job in jobs:
+            gather_pool.submit(gather_stage, job)
+        gather_pool.shutdown(wait=True)
+
+    # llm_pool 이 끝난 뒤에는 큐에 더 들어올 글이 없음
+    publish_queue.put(_DONE)
+    publisher_thread.join()
+    return [results[job.key] for job in jobs]
+
+
+def print_summary(results: list[JobResult], elapsed: Optional[float] = None) -> None:
+    stages = ["gather", "generate", "publish"]
+    rows = [
+        [r.key, r.status, *(r.timings.get(s) for s in stages), r.title or r.error or ""]
+        for r in results
+    ]
+    print(tabulate(rows, headers=["job", "status", *[f"{s}_s" for s in stages], "title / error"],
+                   tablefmt="simple", floatfmt=".2f", missingval="-"))
+    if elapsed is not None:
+        print(f"\n{len(results)}개 작업 / 전체 {elapsed:.2f}s")
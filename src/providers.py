@@ -0,0 +1,477 @@
+"""
+Pluggable market-data providers.
+
+OHLCV / 종목명 조회를 공급원(provider)별 클래스로 분리하고, ProviderChain 이 순서대로 시도합니다.
+- 공급원마다 제한 시간(timeout)을 두어 응답 없는 공급원을 오래 기다리지 않음
+- 연속으로 실패한 공급원은 서킷 브레이커가 일정 시간 건너뜀 (매 요청마다 타임아웃을 기다리지 않도록)
+- 제한 시간을 넘긴 호출은 스레드를 멈출 수 없으므로, 공급원별 동시 실행 수를 제한해
+  응답 없는 공급원이 스레드를 모두 차지하지 못하게 함 (한도에 닿으면 그 공급원은 건너뜀)
+- KRX 상장 목록(get_listing)도 종목명 공급원 순서대로 조회
+- LocalFileProvider 는 디렉터리의 CSV 를 읽으므로 네트워크 없이 결정적인 데이터로 테스트/벤치마크 가능
+
+환경 변수:
+- STOCK_PROVIDERS: OHLCV 공급원 순서 (기본 "fdr,yfinance")
+- STOCK_NAME_PROVIDERS: 종목명/상장 목록 공급원 순서 (기본 "listing,naver,yfinance")
+- STOCK_LOCAL_DATA_DIR: "local" 공급원의 데이터 디렉터리 (<code>.csv, names.csv, listing.csv)
+- STOCK_PROVIDER_TIMEOUT: 기본 제한 시간(초, 기본 10)
+- STOCK_PROVIDER_TIMEOUT_<NAME>: 공급원별 제한 시간 (예: STOCK_PROVIDER_TIMEOUT_YFINANCE=5)
+- STOCK_PROVIDER_MAX_INFLIGHT: 공급원/조회 종류별 최대 동시 실행 수 (기본 4)
+"""
+from __future__ import annotations
+
+import csv
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Optional, Protocol
+
+import pandas as pd
+import requests
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+LISTING_COLUMNS = ["code", "name", "market", "shares"]
+
+_DEFAULT_TIMEOUT = float(os.getenv("STOCK_PROVIDER_TIMEOUT", "10"))
+_MAX_INFLIGHT = int(os.getenv("STOCK_PROVIDER_MAX_INFLIGHT", "4"))
+
+
+def provider_timeout(name: str, default: float = _DEFAULT_TIMEOUT) -> float:
+    value = os.getenv(f"STOCK_PROVIDER_TIMEOUT_{name.upper()}")
+    return float(value) if value else default
+
+
+class DataProvider(Protocol):
+    """
+    get_ohlcv / get_name 은 찾지 못하면 None 또는 빈 DataFrame, 장애 시에는 예외를 던집니다.
+    지원하지 않는 조회는 None 을 반환합니다.
+    get_listing: 상장 목록 DataFrame (columns: code, name, market, shares)
+    """
+
+    name: str
+
+    def get_ohlcv(self, code: str, start, end) -> Optional[pd.DataFrame]:
+        ...
+
+    def get_name(self, code: str) -> Optional[str]:
+        ...
+
+    def get_listing(self) -> Optional[pd.DataFrame]:
+        ...
+
+
+class CircuitBreaker:
+    """
+    `threshold` 번 연속 실패하면 `cooldown` 초 동안 열림(open, 호출 생략).
+    그 뒤 한 번의 시험 호출(half-open)이 성공하면 닫히고, 실패하면 다시 열립니다.
+    """
+
+    def __init__(self, threshold: int = 3, cooldown: float = 60.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                # 시험 호출은 한 번에 하나만
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+def _normalize(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """
+    Common OHLCV shape: DatetimeIndex (tz-naive, sorted) + Open/High/Low/Close/Volume.
+    """
+    if df is None:
+        return None
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.droplevel(-1, axis=1) if df.columns.nlevels > 1 else df
+    missing = [c for c in OHLCV_COLUMNS if c not in df.columns]
+    if missing:
+        return df.iloc[0:0] if df.empty else None
+    df = df.copy()
+    df.index = pd.DatetimeIndex(df.index)
+    if df.index.tz is not None:
+        df.index = df.index.tz_localize(None)
+    df.index.name = "Date"
+    return df.sort_index()
+
+
+class FDRProvider:
+    name = "fdr"
+
+    def get_ohlcv(self, code, start, end):
+        import FinanceDataReader as fdr
+
+        return _normalize(fdr.DataReader(code, start, end))
+
+    def get_name(self, code):
+        return None
+
+    def get_listing(self):
+        return None
+
+
+class YFinanceProvider:
+    """
+    Yahoo Finance (<code>.KS, 없으면 <code>.KQ). 종목명은 영문입니다.
+    """
+
+    name = "yfinance"
+
+    def __init__(self, timeout: float = _DEFAULT_TIMEOUT):
+        self.timeout = timeout
+
+    def get_ohlcv(self, code, start, end):
+        import yfinance as yf
+
+        for suffix in (".KS", ".KQ"):
+            df = yf.download(
+                f"{code}{suffix}",
+                start=pd.Timestamp(start),
+                end=pd.Timestamp(end) + timedelta(days=1),  # yfinance 의 end 는 미포함
+                progress=False,
+                auto_adjust=False,
+                timeout=self.timeout,
+            )
+            df = _normalize(df)
+            if df is not None and not df.empty:
+                return df
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+    def get_name(self, code):
+        import yfinance as yf
+
+        info = yf.Ticker(f"{code}.KS").info or {}
+        return info.get("longName") or info.get("shortName")
+
+    def get_listing(self):
+        return None
+
+
+class ListingProvider:
+    """
+    KRX 상장 목록 (fdr.StockListing, src.listing 이 하루 1회 받아 디스크에 보관). 종목명 / 상장 목록 전용.
+    """
+
+    name = "listing"
+    default_timeout = 30.0  # 전 종목 목록이라 다른 조회보다 오래 걸림
+
+    def get_ohlcv(self, code, start, end):
+        return None
+
+    def get_name(self, code):
+        from src.listing import get_listing_entry
+
+        entry = get_listing_entry(code)
+        return entry.name if entry is not None and entry.name else None
+
+    def get_listing(self):
+        import FinanceDataReader as fdr
+
+        for market in ["KRX", "KRX-MARCAP"]:
+            try:
+                df = fdr.StockListing(market)
+            except Exception as e:
+                print(f"Error fetching listing {market}: {e}")
+                continue
+            if df is None or df.empty or "Code" not in df.columns:
+                continue
+            out = pd.DataFrame({"code": df["Code"].astype(str)})
+            for src_col, col in (("Name", "name"), ("Market", "market"), ("Stocks", "shares")):
+                out[col] = df[src_col].to_numpy() if src_col in df.columns else None
+            return out
+        return None
+
+
+class NaverNameProvider:
+    """
+    네이버 증권 종목 페이지 스크래핑. 종목명 전용.
+    """
+
+    name = "naver"
+    URL = "https://finance.naver.com/item/main.naver?code={code}"
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+
+    def __init__(self, timeout: float = 5.0):
+        self.timeout = timeout
+
+    def get_ohlcv(self, code, start, end):
+        return None
+
+    def get_name(self, code):
+        from bs4 import BeautifulSoup
+
+        response = requests.get(self.URL.format(code=code), headers=self.HEADERS, timeout=self.timeout)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.text, 'html.parser')
+        # "삼성전자 : 네이버 증권" 형식의 title 에서 종목명 추출
+        title_tag = soup.find('title')
+        if title_tag and ':' in title_tag.get_text():
+            name = title_tag.get_text().split(':')[0].strip()
+            if name:
+                return name
+        wrap_company = soup.find('div', class_='wrap_company')
+        h2 = wrap_company.find('h2') if wrap_company else None
+        return (h2.get_text().strip() or None) if h2 else None
+
+    def get_listing(self):
+        return None
+
+
+class LocalFileProvider:
+    """
+    Offline provider reading <root>/<code>.csv (Date,Open,High,Low,Close,Volume),
+    <root>/names.csv (code,name) and <root>/listing.csv (code,name,market,shares).
+    """
+
+    name = "local"
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or os.getenv("STOCK_LOCAL_DATA_DIR", "fixtures"))
+        self._names: Optional[dict[str, str]] = None
+        self._names_mtime: Optional[float] = None
+
+    def get_ohlcv(self, code, start, end):
+        path = self.root / f"{code}.csv"
+        if not path.exists():
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        df = _normalize(pd.read_csv(path, index_col=0, parse_dates=True))
+        lo = df.index.searchsorted(pd.Timestamp(start).normalize(), side="left")
+        hi = df.index.searchsorted(pd.Timestamp(end).normalize() + timedelta(days=1), side="left")
+        return df.iloc[lo:hi]
+
+    def _load_names(self) -> dict[str, str]:
+        # 파일이 바뀌면(다른 인스턴스가 save 한 경우 포함) 다시 읽음
+        path = self.root / "names.csv"
+        mtime = path.stat().st_mtime if path.exists() else None
+        if self._names is None or mtime != self._names_mtime:
+            if mtime is not None:
+                with open(path, encoding="utf-8-sig", newline="") as f:
+                    self._names = {r["code"]: r["name"] for r in csv.DictReader(f)}
+            else:
+                self._names = {}
+            self._names_mtime = mtime
+        return self._names
+
+    def get_name(self, code):
+        return self._load_names().get(code)
+
+    def get_listing(self):
+        path = self.root / "listing.csv"
+        if path.exists():
+            df = pd.read_csv(path, dtype={"code": str, "name": str, "market": str})
+            return df.reindex(columns=LISTING_COLUMNS)
+        names = self._load_names()
+        if not names:
+            return None
+        return pd.DataFrame({"code": list(names), "name": list(names.values())}).reindex(columns=LISTING_COLUMNS)
+
+    def save(self, code: str, df: pd.DataFrame, name: Optional[str] = None) -> None:
+        """
+        Writes a fixture (e.g. a synthetic frame for benchmarks).
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        df[OHLCV_COLUMNS].to_csv(self.root / f"{code}.csv", index_label="Date")
+        if name is not None:
+            self.save_names({**self._load_names(), code: name})
+
+    def save_names(self, names: dict[str, str]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / "names.csv", "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["code", "name"])
+            writer.writerows(sorted(names.items()))
+        self._names = None
+
+    def save_listing(self, listing: pd.DataFrame) -> None:
+        """
+        Writes listing.csv (code, name, market, shares) and the matching names.csv.
+        """
+        listing = listing.reindex(columns=LISTING_COLUMNS)
+        self.root.mkdir(parents=True, exist_ok=True)
+        listing.to_csv(self.root / "listing.csv", index=False)
+        self.save_names(dict(zip(listing["code"].astype(str), listing["name"].astype(str))))
+
+
+PROVIDERS: dict[str, Callable[[], DataProvider]] = {
+    "fdr": FDRProvider,
+    "yfinance": YFinanceProvider,
+    "listing": ListingProvider,
+    "naver": NaverNameProvider,
+    "local": LocalFileProvider,
+}
+
+
+class ProviderChain:
+    """
+    Tries providers in order with per-provider timeouts and circuit breakers.
+    """
+
+    def __init__(
+        self,
+        ohlcv: list[DataProvider],
+        names: Optional[list[DataProvider]] = None,
+        timeouts: Optional[dict[str, float]] = None,
+        threshold: int = 3,
+        cooldown: float = 60.0,
+        max_inflight: int = _MAX_INFLIGHT,
+    ):
+        self.ohlcv = list(ohlcv)
+        self.names = list(names if names is not None else ohlcv)
+        providers = {p.name: p for p in [*self.ohlcv, *self.names]}
+        # 우선순위: 인자 > STOCK_PROVIDER_TIMEOUT_<NAME> > 공급원 기본값 > STOCK_PROVIDER_TIMEOUT
+        self.timeouts = {
+            name: provider_timeout(name, getattr(p, "default_timeout", _DEFAULT_TIMEOUT))
+            for name, p in providers.items()
+        }
+        self.timeouts.update(timeouts or {})
+        self.breakers: dict[str, CircuitBreaker] = {name: CircuitBreaker(threshold, cooldown) for name in providers}
+        # (공급원, 조회 종류)별 동시 실행 수 제한. 제한 시간을 넘긴 호출은 끝날 때까지 자리를 차지함
+        self.max_inflight = max(1, max_inflight)
+        self._slots: dict[tuple[str, str], threading.BoundedSemaphore] = {}
+        self._slots_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_inflight * len(providers) * 3, thread_name_prefix="provider"
+        )
+
+    def _slot(self, name: str, method: str) -> threading.BoundedSemaphore:
+        with self._slots_lock:
+            slot = self._slots.get((name, method))
+            if slot is None:
+                slot = self._slots[(name, method)] = threading.BoundedSemaphore(self.max_inflight)
+            return slot
+
+    def _call(self, provider: DataProvider, method: str, *args) -> Any:
+        breaker = self.breakers[provider.name]
+        target = f"{method} {args[0]}" if args else method
+        slot = self._slot(provider.name, method)
+        # 자리를 먼저 잡은 뒤 breaker 에 묻습니다. half-open 시험 호출을 받아 놓고 건너뛰면
+        # 성공/실패가 기록되지 않아 breaker 가 영영 열린 채로 남기 때문
+        if not slot.acquire(blocking=False):
+            # 이전 호출들이 아직 끝나지 않음 (응답 없는 공급원) → 기다리지 않고 다음 공급원으로
+            print(f"Provider {provider.name} busy ({self.max_inflight} calls still running), skipping {target}")
+            return None
+        if not breaker.allow():
+            slot.release()
+            return None
+        try:
+            future = self._executor.submit(getattr(provider, method), *args)
+        except BaseException:
+            slot.release()
+            raise
+        future.add_done_callback(lambda _: slot.release())
+
+        timeout = self.timeouts.get(provider.name, _DEFAULT_TIMEOUT)
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeout:
+            future.cancel()
+            print(f"Provider {provider.name} timed out after {timeout:g}s ({target})")
+            breaker.record_failure()
+            return None
+        except Exception as e:
+            print(f"Provider {provider.name} failed ({target}): {e}")
+            breaker.record_failure()
+            return None
+        breaker.record_success()
+        return result
+
+    def get_ohlcv(self, code: str, start, end) -> Optional[pd.DataFrame]:
+        """
+        First non-empty frame. 모든 공급원이 빈 결과면 빈 DataFrame, 전부 실패하면 None.
+        """
+        empty = None
+        for provider in self.ohlcv:
+            df = self._call(provider, "get_ohlcv", code, start, end)
+            if df is None:
+                continue
+            if not df.empty:
+                return df
+            empty = df
+        return empty
+
+    def get_name(self, code: str) -> Optional[str]:
+        for provider in self.names:
+            name = self._call(provider, "get_name", code)
+            if name:
+                return name
+        return None
+
+    def get_listing(self) -> Optional[pd.DataFrame]:
+        """
+        KRX listing (code, name, market, shares) from the first name provider that has one.
+        """
+        for provider in self.names:
+            df = self._call(provider, "get_listing")
+            if df is not None and not df.empty:
+                return df.reindex(columns=LISTING_COLUMNS)
+        return None
+
+    def stats(self) -> dict:
+        return {
+            name: {"state": b.state, "failures": b.failures}
+            for name, b in self.breakers.items()
+        }
+
+
+def _build(spec: str) -> list[DataProvider]:
+    return [PROVIDERS[n.strip()]() for n in spec.split(",") if n.strip() in PROVIDERS]
+
+
+_default_chain: Optional[ProviderChain] = None
+_chain_lock = threading.Lock()
+
+
+def get_providers() -> ProviderChain:
+    global _default_chain
+    with _chain_lock:
+        if _default_chain is None:
+            _default_chain = ProviderChain(
+                ohlcv=_build(os.getenv("STOCK_PROVIDERS", "fdr,yfinance")),
+                names=_build(os.getenv("STOCK_NAME_PROVIDERS", "listing,naver,yfinance")),
+            )
+        return _default_chain
+
+
+def set_providers(chain: Optional[ProviderChain]) -> None:
+    """
+    Replaces the process-wide chain (e.g. LocalFileProvider for offline runs). None resets to env defaults.
+    """
+    global _default_chain
+    with _chain_lock:
+        _default_chain = chain
@@ -0,0 +1,88 @@
+"""
+Batch 투자경고 해제 일정 계산.
+
+여러 (종목코드, 지정일) 쌍의 데이터를 제한된 동시성으로 받아 get_release_schedule 을
+계산하고, 끝나는 순서대로 결과를 돌려줍니다.
+"""
+from __future__ import annotations
+
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import pandas as pd
+
+from src.checkers.warning_release import get_release_schedule
+from src.data_fetcher import get_stock_data, get_stock_name
+from src.report import _to_builtin
+
+# T-15 종가와 휴장일 여유분
+_LOOKBACK_DAYS = 45
+
+
+def load_release_requests(path: str) -> list[dict[str, str]]:
+    """
+    Reads code + designation_date pairs from a CSV (header: code,designation_date)
+    or JSON ([{"code": ..., "designation_date": ...}, ...]) file.
+    """
+    p = Path(path)
+    if p.suffix.lower() == ".json":
+        with open(p, encoding="utf-8") as f:
+            rows = json.load(f)
+    else:
+        with open(p, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+
+    items = []
+    for row in rows:
+        code = str(row.get("code", "")).strip()
+        designation_date = str(row.get("designation_date", "")).strip()
+        if code and designation_date:
+            items.append({"code": code, "designation_date": designation_date})
+    return items
+
+
+def release_schedule_for(code: str, designation_date: str) -> dict[str, Any]:
+    """
+    Fetches enough history for one designated stock and computes its release schedule.
+    """
+    result: dict[str, Any] = {"code": code, "designation_date": designation_date}
+    try:
+        days_since = (datetime.today() - pd.to_datetime(designation_date)).days
+    except Exception:
+        result["error"] = "designation_date 형식이 올바르지 않습니다. (YYYY-MM-DD)"
+        return result
+
+    result["name"] = get_stock_name(code)
+    df = get_stock_data(code, days=max(120, days_since + _LOOKBACK_DAYS))
+    if df is None or df.empty:
+        result["error"] = "데이터를 가져오는데 실패했습니다."
+        return result
+
+    schedule = get_release_schedule(df, designation_date)
+    if "error" in schedule:
+        result["error"] = schedule["error"]
+    else:
+        result["schedule"] = _to_builtin(schedule)
+    return result
+
+
+def iter_release_schedules(items: Iterable[dict[str, str]], max_workers: int = 8) -> Iterator[dict[str, Any]]:
+    """
+    Computes schedules concurrently (at most `max_workers` fetches in flight)
+    and yields each result as soon as it finishes.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {
+            pool.submit(release_schedule_for, item["code"], item["designation_date"]): item
+            for item in items
+        }
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {**item, "error": str(e)}
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from functools import partial
+from datetime import datetime, time as dt_time, timedelta
 from typing import Any, Optional
+from zoneinfo import ZoneInfo
 
 import pandas as pd
 
+from src.cache import TTLCache
 from src.data_fetcher import get_stock_data, get_stock_name
-from src.indicators import calculate_indicators
+from src.indicators import compute_indicator_frame
+from src.listing import ListingEntry, get_listing_entry
 from src.checkers.overheating import check_overheating
 from src.checkers.caution import check_caution
 from src.checkers.warning import check_warning
@@ -37,6 +47,42 @@ def _to_builtin(v: Any) -> Any:
     return v
 
 
+# 종목명/OHLCV/상장정보 조회를 동시에 실행하기 위한 전용 executor (네트워크 I/O 대기용)
+_FETCH_WORKERS = int(os.getenv("STOCK_FETCH_WORKERS", "16"))
+_fetch_executor = ThreadPoolExecutor(max_workers=_FETCH_WORKERS, thread_name_prefix="stock-fetch")
+
+
+def _fetchers(date: Optional[str]) -> tuple:
+    # 기준일이 있으면 그 날짜에서 끝나는 구간만 읽음 (저장소에서 이분 탐색, 확정 봉이면 원격 조회 없음)
+    return (get_stock_name, partial(get_stock_data, end=date or None), get_listing_entry)
+
+
+def _validate_input(code: str, date: Optional[str]) -> Optional[dict[str, Any]]:
+    if not code:
+        return {"ok": False, "error": {"message": "종목코드를 입력해주세요."}}
+    if date:
+        try:
+            # Accept YYYY-MM-DD; allow datetime-like strings that pandas can parse.
+            pd.to_datetime(date)
+        except Exception:
+            return {"ok": False, "error": {"message": "date 형식이 올바르지 않습니다. (YYYY-MM-DD)"}}
+    return None
+
+
+def _fetch_report_inputs(code: str, date: Optional[str] = None) -> tuple:
+    """
+    Runs the name lookup, OHLCV fetch and listing lookup concurrently.
+    Returns (stock_name, df, listing).
+    """
+    futures = [_fetch_executor.submit(fn, code) for fn in _fetchers(date)]
+    return tuple(f.result() for f in futures)
+
+
+async def _fetch_report_inputs_async(code: str, date: Optional[str] = None) -> tuple:
+    loop = asyncio.get_running_loop()
+    return tuple(await asyncio.gather(*(loop.run_in_executor(_fetch_executor, fn, code) for fn in _fetchers(date))))
+
+
 def generate_stock_report(code: str, date: Optional[str] = None) -> dict[str, Any]:
     """
     Generate a JSON-friendly report for a KRX stock code.
@@ -45,38 +91,60 @@ def generate_stock_report(code: str, date: Optional[str] = None) -> dict[str, An
     - date: 기준일(YYYY-MM-DD). 주어지면 해당 날짜 이하 데이터만 사용
     """
     code = str(code).strip()
-    if not code:
-        return {"ok": False, "error": {"message": "종목코드를 입력해주세요."}}
+    invalid = _validate_input(code, date)
+    if invalid:
+        return invalid
+
+    stock_name, df, listing = _fetch_report_inputs(code, date)
+    return build_stock_report(code, date, stock_name, df, listing)
+
+
+async def generate_stock_report_async(code: str, date: Optional[str] = None) -> dict[str, Any]:
+    """
+    Async generate_stock_report: 조회는 fetch executor 에서 동시에, 지표 계산은 별도 스레드에서
+    실행하여 이벤트 루프를 막지 않습니다. 요청 하나의 대기 시간은 조회 시간들의 합이 아니라 최댓값입니다.
+    """
+    code = str(code).strip()
+    invalid = _validate_input(code, date)
+    if invalid:
+        return invalid
+
+    stock_name, df, listing = await _fetch_report_inputs_async(code, date)
+    return await asyncio.to_thread(build_stock_report, code, date, stock_name, df, listing)
 
-    # Get stock name
-    stock_name = get_stock_name(code)
 
-    df = get_stock_data(code)
+def build_stock_report(
+    code: str,
+    date: Optional[str],
+    stock_name: Optional[str],
+    df: Optional[pd.DataFrame],
+    listing: Optional[ListingEntry] = None,
+) -> dict[str, Any]:
+    """
+    Builds the report from already-fetched inputs (no network I/O).
+    """
     if df is None or df.empty:
         return {"ok": False, "error": {"message": "데이터 조회 실패. 종목코드를 확인해주세요."}}
 
     if date:
-        try:
-            # Accept YYYY-MM-DD; allow datetime-like strings that pandas can parse.
-            cutoff = pd.to_datetime(date).date()
-        except Exception:
-            return {"ok": False, "error": {"message": "date 형식이 올바르지 않습니다. (YYYY-MM-DD)"}}
-
-        df = df[df.index.date <= cutoff]
+        # 정렬된 날짜 인덱스에서 기준일 다음 날 00:00 이전까지 (이분 탐색)
+        cutoff = pd.to_datetime(date).normalize() + pd.Timedelta(days=1)
+        df = df.iloc[: df.index.searchsorted(cutoff, side="left")]
         if df.empty:
             return {
                 "ok": False,
                 "error": {"message": f"해당 날짜({date}) 이전 데이터가 없습니다."},
             }
 
-    df = calculate_indicators(df)
+    shares = listing.shares if listing is not None else None
+    frame = compute_indicator_frame(df)
 
-    oh_triggered, oh_details = check_overheating(df)
-    ca_triggered, ca_details = check_caution(df)
-    wa_triggered, wa_details = check_warning(df)
+    oh_triggered, oh_details = check_overheating(frame)
+    ca_triggered, ca_details = check_caution(frame)
+    wa_triggered, wa_details = check_warning(frame)
 
-    latest = df.iloc[-1]
-    latest_date = df.index[-1]
+    latest = frame.latest()
+    latest_date = frame.index[-1]
 
     report = {
         "ok": True,
@@ -86,6 +154,8 @@ def generate_stock_report(code: str, date: Optional[str] = None) -> dict[str, An
             "latest_close": _to_builtin(latest.get("Close")),
             "currency": "KRW",
             "stock_name": stock_name,  # 종목명
+            "market": listing.market if listing is not None else None,
+            "shares_outstanding": shares,  # 상장주식수
         },
         "status": {
             "caution": bool(ca_triggered),  # 투자주의종목
@@ -111,3 +181,149 @@ def generate_stock_report(code: str, date: Optional[str] = None) -> dict[str, An
 
     return report
 
+
+
+# ---------------------------------------------------------------------------
+# Report cache
+# ---------------------------------------------------------------------------
+
+_KST = ZoneInfo("Asia/Seoul")
+_SESSION_OPEN = dt_time(9, 0)
+# 장 마감(15:30) 후 데이터 제공처에 종가가 반영될 때까지 여유를 둠
+_SESSION_SETTLED = dt_time(16, 0)
+# 장중에는 마지막 봉이 계속 바뀌므로 짧게만 캐시
+_LIVE_TTL = float(os.getenv("STOCK_REPORT_LIVE_TTL", "60"))
+
+
+@dataclass(frozen=True)
+class CachedReport:
+    report: dict[str, Any]
+    etag: str
+    last_modified: float  # epoch seconds
+    ttl: float  # 캐시 유지 시간(초), 과거 날짜는 inf
+
+
+def _normalize_date(date: Optional[str]) -> Optional[str]:
+    if not date:
+        return None
+    try:
+        return pd.to_datetime(date).date().isoformat()
+    except Exception:
+        return date
+
+
+def _seconds_until_next_bar(now: datetime) -> float:
+    """
+    오늘 기준 리포트가 바뀔 수 있는 다음 시점까지 남은 시간.
+    장중(09:00~16:00, 평일)에는 _LIVE_TTL, 그 외에는 다음 평일 장 시작까지.
+    """
+    if now.weekday() < 5 and _SESSION_OPEN <= now.time() < _SESSION_SETTLED:
+        return _LIVE_TTL
+    day = now.date() if (now.weekday() < 5 and now.time() < _SESSION_OPEN) else now.date() + timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    next_open = datetime.combine(day, _SESSION_OPEN, tzinfo=_KST)
+    return max(_LIVE_TTL, (next_open - now).total_seconds())
+
+
+def report_ttl(date: Optional[str], now: Optional[datetime] = None) -> float:
+    """
+    과거 날짜 리포트는 바뀌지 않으므로 영구 캐시, 오늘(또는 date 없음)은 다음 봉까지.
+    """
+    now = now or datetime.now(_KST)
+    if date and date < now.date().isoformat():
+        return float("inf")
+    return _seconds_until_next_bar(now)
+
+
+def _etag(report: dict[str, Any]) -> str:
+    body = json.dumps(report, ensure_ascii=False, sort_keys=True, default=str)
+    return '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+
+
+class ReportCache:
+    """
+    (code, date) -> CachedReport. 실패한 리포트(ok=False)는 캐시하지 않습니다.
+    """
+
+    def __init__(self, maxsize: int = 2048):
+        self._cache = TTLCache(maxsize=maxsize, ttl=float("inf"))
+        self._inflight: dict[tuple, asyncio.Future] = {}
+
+    def _store(self, key: tuple, report: dict[str, Any]) -> CachedReport:
+        entry = CachedReport(report, _etag(report), time.time(), report_ttl(key[1]))
+        if report.get("ok"):
+            self._cache.set(key, entry, ttl=entry.ttl)
+        return entry
+
+    def get(self, code: str, date: Optional[str] = None) -> CachedReport:
+        key = (str(code).strip(), _normalize_date(date))
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = self._store(key, generate_stock_report(key[0], key[1]))
+        return entry
+
+    async def get_async(self, code: str, date: Optional[str] = None) -> CachedReport:
+        key = (str(code).strip(), _normalize_date(date))
+        entry = self._cache.get(key)
+        if entry is not None:
+            return entry
+
+        # 같은 key 에 대한 동시 요청은 한 번만 생성
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            entry = self._store(key, await generate_stock_report_async(key[0], key[1]))
+            future.set_result(entry)
+            return entry
+        except BaseException as e:
+            future.set_exception(e)
+            # 기다리는 쪽이 없을 때 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+report_cache = ReportCache()
+
+
+_BATCH_CONCURRENCY = int(os.getenv("STOCK_BATCH_CONCURRENCY", "8"))
+
+
+async def generate_stock_reports_async(
+    codes: list[str], date: Optional[str] = None, concurrency: int = _BATCH_CONCURRENCY
+) -> dict[str, dict[str, Any]]:
+    """
+    Reports for many codes at once: code -> report.
+
+    중복 코드는 한 번만 계산하고, 동시에 최대 `concurrency` 종목만 조회합니다.
+    report_cache 를 거치므로 단건 API 와 캐시를 공유하며, 한 종목의 실패가 전체를 실패시키지 않습니다.
+
+    지표는 스크리너처럼 하나의 panel 로 묶어 계산하지 않고 종목별로 계산합니다.
+    리포트에는 check_* 의 조건별 details 가 필요하고(panel 신호에는 없음) 종목마다 기준일/길이가
+    다를 수 있으며, 종목당 계산은 수 ms 로 조회 시간에 비해 작기 때문입니다.
+    대신 report_cache 가 같은 (code, date) 의 계산을 단건/배치 요청 사이에서 공유합니다.
+    """
+    unique = list(dict.fromkeys(c for c in (str(c).strip() for c in codes) if c))
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(code: str) -> dict[str, Any]:
+        async with semaphore:
+            try:
+                return (await report_cache.get_async(code, date)).report
+            except Exception as e:
+                return {"ok": False, "error": {"message": f"리포트 생성 실패: {e}"}}
+
+    reports = await asyncio.gather(*(one(code) for code in unique))
+    return dict(zip(unique, reports))
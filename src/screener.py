@@ -0,0 +1,165 @@
+"""
+Market-wide screener.
+
+로컬 OHLCV 저장소(src.store)에서 전 종목을 하나의 panel(최근 N봉 x 종목)로 읽어,
+지표와 투자주의/투자경고/단기과열 조건을 종목 루프 없이 배열 연산으로 한 번에 평가합니다.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.checkers.caution import caution_signals
+from src.checkers.overheating import overheating_signals
+from src.checkers.warning import warning_signals
+from src.data_fetcher import get_stock_data
+from src.indicators import calculate_panel_indicators
+from src.listing import get_listing_index
+from src.store import OHLCVStore, get_store
+
+PANEL_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def universe_codes(store: Optional[OHLCVStore] = None) -> list[str]:
+    """
+    KRX 상장 종목 전체. 상장 목록을 받을 수 없으면 저장소에 있는 종목으로 대체합니다.
+    """
+    index = get_listing_index()
+    if index is not None and len(index):
+        return index.codes()
+    return (store or get_store()).codes()
+
+
+def refresh_store(codes: Iterable[str], max_workers: int = 8, days: int = 120) -> None:
+    """
+    Tops up the local store for every code (network bound, runs on threads).
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(lambda c: get_stock_data(c, days=days), codes))
+
+
+def load_panel(codes: Iterable[str], bars: int = 120, store: Optional[OHLCVStore] = None):
+    """
+    Loads the last `bars` daily bars of each code into right-aligned 2D arrays.
+
+    행은 '마지막 봉 기준 위치'(마지막 행 = 각 종목의 최신 봉)이고, 상장 기간이 짧은
+    종목은 앞쪽이 NaN 으로 채워집니다. 따라서 shift/rolling 이 종목별 df.iloc[-k] 와 같은
+    의미를 가집니다.
+
+    Returns: (panel, as_of) - panel: {field: DataFrame(bars x codes)}, as_of: Series(code -> 최신일)
+    """
+    store = store or get_store()
+    codes = list(codes)
+    arrays = {f: np.full((bars, len(codes)), np.nan) for f in PANEL_FIELDS}
+    kept: list[str] = []
+    last_days: list[int] = []
+
+    for code in codes:
+        raw = store.read_raw(code)
+        if raw is None or len(raw["dates"]) == 0:
+            continue
+        try:
+            col_idx = [raw["columns"].index(f) for f in PANEL_FIELDS]
+        except ValueError:
+            continue
+        values = raw["values"][-bars:]
+        n, j = len(values), len(kept)
+        for f, ci in zip(PANEL_FIELDS, col_idx):
+            arrays[f][bars - n:, j] = values[:, ci]
+        kept.append(code)
+        last_days.append(int(raw["dates"][-1]))
+
+    panel = {f: pd.DataFrame(arr[:, : len(kept)], columns=kept) for f, arr in arrays.items()}
+    as_of = pd.Series(
+        np.array(last_days, dtype="datetime64[D]").astype("datetime64[ns]"), index=kept, name="as_of"
+    )
+    return panel, as_of
+
+
+def _latest(signals: dict) -> dict:
+    return {name: {k: (v.iloc[-1] if hasattr(v, "iloc") else v) for k, v in sig.items()} for name, sig in signals.items()}
+
+
+def screen(
+    codes: Optional[Iterable[str]] = None,
+    refresh: bool = False,
+    bars: int = 120,
+    max_workers: int = 8,
+    only_triggered: bool = False,
+    store: Optional[OHLCVStore] = None,
+) -> pd.DataFrame:
+    """
+    Runs all checkers over the universe in one batch pass and returns a ranked table.
+
+    정렬: 투자경고 > 투자주의 > 단기과열 해당 여부, 그다음 가장 가까운 목표가까지 남은 상승률(gap) 오름차순.
+    """
+    store = store or get_store()
+    codes = list(codes) if codes is not None else universe_codes(store)
+    if refresh:
+        refresh_store(codes, max_workers=max_workers)
+
+    panel, as_of = load_panel(codes, bars=bars, store=store)
+    if not len(as_of):
+        return pd.DataFrame()
+    calculate_panel_indicators(panel)
+
+    ca_all, ca_sig = caution_signals(panel)
+    wa_all, wa_sig = warning_signals(panel)
+    oh_all, oh_sig = overheating_signals(panel)
+    ca_sig, wa_sig, oh_sig = _latest(ca_sig), _latest(wa_sig), _latest(oh_sig)
+
+    close = panel["Close"].iloc[-1]
+    targets = pd.DataFrame(
+        {name: sig["target_price"] for name, sig in {**ca_sig, **wa_sig}.items()}
+    )
+    # 아직 넘지 않은 목표가 중 가장 가까운 것
+    pending = targets.where(targets.gt(close, axis=0))
+    nearest = pending.min(axis=1)
+
+    # 충족된 조건명을 ", " 로 이어붙임 (bool 행렬 x 이름 벡터)
+    hits = pd.DataFrame({name: sig["triggered"] for name, sig in {**wa_sig, **ca_sig, **oh_sig}.items()})
+    rules = hits.dot(hits.columns + ", ").str.rstrip(", ")
+
+    index = get_listing_index()
+    names = [e.name if index is not None and (e := index.get(c)) is not None else None for c in as_of.index]
+
+    table = pd.DataFrame(
+        {
+            "code": as_of.index,
+            "name": names,
+            "as_of": as_of.to_numpy(),
+            "close": close.to_numpy(),
+            "warning": wa_all.iloc[-1].to_numpy(dtype=bool),
+            "caution": ca_all.iloc[-1].to_numpy(dtype=bool),
+            "overheating": oh_all.iloc[-1].to_numpy(dtype=bool),
+            "rules": rules.to_numpy(),
+            "nearest_target": nearest.to_numpy(),
+            "gap": (nearest / close - 1).to_numpy(),
+        }
+    )
+
+    if only_triggered:
+        table = table[table["warning"] | table["caution"] | table["overheating"]]
+
+    table = table.sort_values(
+        ["warning", "caution", "overheating", "gap"],
+        ascending=[False, False, False, True],
+        na_position="last",
+        kind="stable",
+    ).reset_index(drop=True)
+    return table
+
+
+def to_records(table: pd.DataFrame) -> list[dict]:
+    """
+    JSON-friendly rows (NaN -> None, Timestamp -> YYYY-MM-DD).
+    """
+    if table.empty:
+        return []
+    out = table.copy()
+    out["as_of"] = out["as_of"].dt.strftime("%Y-%m-%d")
+    out = out.astype(object).where(out.notna(), None)
+    return out.to_dict(orient="records")
@@ -0,0 +1,264 @@
+"""
+Daily report snapshot.
+
+장 마감 후 전 종목의 리포트를 한 번 계산해 SQLite(.cache/snapshot/reports.db)에 저장하고,
+API 는 date 없는 요청을 메모리에 올린 스냅샷에서 바로 응답합니다.
+
+- reports: (code, session) 별 리포트 JSON + ETag
+- runs: 실행별 진행 상황과 단계별 소요 시간
+이미 저장된 종목은 건너뛰므로 중단된 작업을 같은 session 으로 다시 실행하면 이어서 진행합니다.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from src.data_fetcher import get_stock_data, get_stock_name
+from src.listing import get_listing_entry
+from src.report import _KST, CachedReport, _etag, build_stock_report, report_ttl
+from src.store import cache_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    code TEXT NOT NULL,
+    session TEXT NOT NULL,
+    body TEXT NOT NULL,
+    etag TEXT NOT NULL,
+    generated_at REAL NOT NULL,
+    PRIMARY KEY (code, session)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    session TEXT PRIMARY KEY,
+    started_at REAL,
+    finished_at REAL,
+    total INTEGER,
+    done INTEGER,
+    failed INTEGER,
+    metrics TEXT
+);
+"""
+
+
+def _connect(path: Path, readonly: bool = False) -> sqlite3.Connection:
+    if readonly:
+        # 읽기 전용 경로: 스키마/PRAGMA 없이 열기만 함 (작업이 만들어 둔 DB 를 읽음)
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {}
+    arr = np.asarray(values) * 1000
+    return {
+        "total_s": round(float(arr.sum()) / 1000, 3),
+        "p50_ms": round(float(np.percentile(arr, 50)), 2),
+        "p95_ms": round(float(np.percentile(arr, 95)), 2),
+        "max_ms": round(float(arr.max()), 2),
+    }
+
+
+class SnapshotStore:
+    """
+    SQLite-backed snapshot with an in-memory view of the latest session.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else cache_dir("snapshot") / "reports.db"
+        self._lock = threading.Lock()
+        self._loaded_mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._refreshing = False
+        self._session: Optional[str] = None
+        self._loaded_through = 0.0  # 메모리에 반영된 마지막 generated_at
+        self._memory: dict[str, CachedReport] = {}
+
+    # --- writing -----------------------------------------------------------
+
+    def done_codes(self, session: str) -> set[str]:
+        with closing(_connect(self.path)) as conn:
+            return {row[0] for row in conn.execute("SELECT code FROM reports WHERE session = ?", (session,))}
+
+    def run_job(
+        self,
+        codes: Iterable[str],
+        session: Optional[str] = None,
+        workers: int = 8,
+        resume: bool = True,
+        progress_every: int = 100,
+    ) -> dict:
+        """
+        Materializes generate_stock_report results for `codes` into the snapshot.
+
+        Returns the run metrics (also stored in the runs table).
+        """
+        session = session or datetime.now(_KST).date().isoformat()
+        codes = list(dict.fromkeys(codes))
+        skip = self.done_codes(session) if resume else set()
+        todo = [c for c in codes if c not in skip]
+
+        timings: dict[str, list[float]] = {"fetch": [], "compute": []}
+        started = time.time()
+        done = failed = 0
+
+        def work(code: str):
+            t0 = time.perf_counter()
+            name, df, listing = get_stock_name(code), get_stock_data(code), get_listing_entry(code)
+            t1 = time.perf_counter()
+            report = build_stock_report(code, None, name, df, listing)
+            t2 = time.perf_counter()
+            return code, report, t1 - t0, t2 - t1
+
+        conn = _connect(self.path)
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO runs (session, started_at, total, done, failed) VALUES (?, ?, ?, ?, 0)",
+                (session, started, len(codes), len(skip)),
+            )
+            conn.commit()
+            write_time = []
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                futures = [pool.submit(work, code) for code in todo]
+                for future in as_completed(futures):
+                    try:
+                        code, report, fetch_s, compute_s = future.result()
+                    except Exception as e:
+                        print(f"Error building snapshot report: {e}")
+                        failed += 1
+                        continue
+                    timings["fetch"].append(fetch_s)
+                    timings["compute"].append(compute_s)
+                    if not report.get("ok"):
+                        failed += 1
+                        continue
+                    t0 = time.perf_counter()
+                    conn.execute(
+                        "INSERT OR REPLACE INTO reports (code, session, body, etag, generated_at) VALUES (?, ?, ?, ?, ?)",
+                        (code, session, json.dumps(report, ensure_ascii=False), _etag(report), time.time()),
+                    )
+                    done += 1
+                    if done % progress_every == 0:
+                        conn.commit()
+                        print(f"  {len(skip) + done}/{len(codes)} 완료 (실패 {failed})")
+                    write_time.append(time.perf_counter() - t0)
+            conn.commit()
+
+            metrics = {
+                "elapsed_s": round(time.time() - started, 3),
+                "skipped": len(skip),
+                "fetch": _percentiles(timings["fetch"]),
+                "compute": _percentiles(timings["compute"]),
+                "write": _percentiles(write_time),
+            }
+            conn.execute(
+                "UPDATE runs SET finished_at = ?, done = ?, failed = ?, metrics = ? WHERE session = ?",
+                (time.time(), len(skip) + done, failed, json.dumps(metrics), session),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        return {"session": session, "total": len(codes), "done": len(skip) + done, "failed": failed, **metrics}
+
+    # --- reading -----------------------------------------------------------
+
+    def refresh(self) -> None:
+        """
+        Loads new reports of the latest session into memory if the DB file changed.
+
+        같은 session 이면 마지막으로 읽은 뒤 추가된 행만 읽어 파싱합니다 (작업 실행 중에도 가벼움).
+        """
+        try:
+            mtime = max(os.path.getmtime(p) for p in (self.path, Path(f"{self.path}-wal")) if p.exists())
+        except ValueError:
+            return
+        if mtime == self._loaded_mtime:
+            return
+
+        with closing(_connect(self.path, readonly=True)) as conn:
+            row = conn.execute("SELECT MAX(session) FROM reports").fetchone()
+            session = row[0] if row else None
+            since = self._loaded_through if session == self._session else -1.0
+            rows = [] if session is None else conn.execute(
+                "SELECT code, body, etag, generated_at FROM reports WHERE session = ? AND generated_at > ?",
+                (session, since),
+            ).fetchall()
+
+        memory = dict(self._memory) if session == self._session else {}
+        for code, body, etag, generated_at in rows:
+            ttl = report_ttl(None, datetime.fromtimestamp(generated_at, _KST))
+            memory[code] = CachedReport(json.loads(body), etag, generated_at, ttl)
+        # 읽는 쪽은 잠금 없이 dict 참조만 바꿔 끼움
+        self._memory = memory
+        self._session = session
+        self._loaded_through = max([since, *(r[3] for r in rows)])
+        self._loaded_mtime = mtime
+
+    def refresh_in_background(self) -> None:
+        """
+        Starts a refresh on a background thread (at most one at a time, at most once a second).
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._refreshing or now - self._checked_at < 1.0:
+                return
+            self._refreshing = True
+            self._checked_at = now
+        threading.Thread(target=self._refresh_worker, name="snapshot-refresh", daemon=True).start()
+
+    def _refresh_worker(self) -> None:
+        try:
+            self.refresh()
+        except sqlite3.Error as e:
+            print(f"Error refreshing snapshot: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def lookup(self, code: str) -> Optional[CachedReport]:
+        """
+        Returns the snapshot report for `code` if it is still current (before the next bar).
+
+        이벤트 루프에서 호출되므로 DB 를 직접 읽지 않고, 변경 확인/로드는 백그라운드 스레드에 맡깁니다.
+        """
+        if not self.path.exists():
+            return None
+        self.refresh_in_background()
+        entry = self._memory.get(code)
+        if entry is None or time.time() >= entry.last_modified + entry.ttl:
+            return None
+        return entry
+
+    def runs(self, limit: int = 10) -> list[dict]:
+        with closing(_connect(self.path, readonly=True)) as conn:
+            rows = conn.execute(
+                "SELECT session, started_at, finished_at, total, done, failed, metrics FROM runs ORDER BY session DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        keys = ["session", "started_at", "finished_at", "total", "done", "failed", "metrics"]
+        out = [dict(zip(keys, r)) for r in rows]
+        for r in out:
+            r["metrics"] = json.loads(r["metrics"]) if r["metrics"] else None
+        return out
+
+
+_default_snapshot: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store() -> SnapshotStore:
+    global _default_snapshot
+    if _default_snapshot is None:
+        _default_snapshot = SnapshotStore()
+    return _default_snapshot
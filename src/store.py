@@ -0,0 +1,218 @@
+"""
+On-disk OHLCV store.
+
+종목별로 `<code>.npz` 파일 하나에 일봉 데이터를 보관합니다.
+- dates: int64 (epoch day)
+- values: float64 2D 배열 (행=일자, 열=columns)
+- columns / dtypes: 컬럼명과 원래 dtype (읽을 때 정수형 복원용)
+- covered_from: 이 파일이 빠짐없이 보관하고 있다고 보장하는 시작일 (epoch day)
+- updated_at: 마지막으로 오늘까지의 원격 데이터를 받아온 시각 (epoch seconds)
+- final_through: 이 날짜(epoch day)까지는 빠짐없이 확정 봉으로 보관 (장중 미완성 봉 없음)
+
+쓰기는 임시 파일 + os.replace 로 원자적으로 교체하므로, 다른 워커가 읽는 도중에도
+깨진 파일을 보지 않습니다. 원격 top-up 은 종목별 lock 파일로 직렬화합니다.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+CACHE_ROOT = Path(os.getenv("STOCK_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cache"))
+
+# 마지막 top-up 이후 이 시간(초) 안에는 원격 조회 없이 저장소 데이터를 그대로 사용
+DEFAULT_MAX_AGE = float(os.getenv("STOCK_STORE_MAX_AGE", "600"))
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def cache_dir(*parts: str) -> Path:
+    """
+    Returns (and creates) a directory under the local cache root.
+    """
+    path = CACHE_ROOT.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _to_days(index: pd.DatetimeIndex) -> np.ndarray:
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype("datetime64[D]").astype(np.int64)
+
+
+def _from_days(days: np.ndarray) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex((_EPOCH + days.astype("timedelta64[D]")).astype("datetime64[ns]"), name="Date")
+
+
+def _day(ts) -> int:
+    return int(_to_days(pd.DatetimeIndex([pd.Timestamp(ts)]))[0])
+
+
+class OHLCVStore:
+    """
+    Per-code columnar store for daily OHLCV bars.
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_age: float = DEFAULT_MAX_AGE):
+        self.root = Path(root) if root is not None else cache_dir("ohlcv")
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self._thread_locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _path(self, code: str) -> Path:
+        return self.root / f"{code}.npz"
+
+    def codes(self) -> list[str]:
+        return sorted(p.stem for p in self.root.glob("*.npz"))
+
+    def read_raw(self, code: str) -> Optional[dict]:
+        """
+        Returns the raw arrays for a code, or None if nothing is stored.
+        """
+        path = self._path(code)
+        try:
+            with np.load(path, allow_pickle=False) as f:
+                return {
+                    "dates": f["dates"],
+                    "values": f["values"],
+                    "columns": [str(c) for c in f["columns"]],
+                    "dtypes": [str(d) for d in f["dtypes"]],
+                    "covered_from": _from_days(np.atleast_1d(f["covered_from"]))[0],
+                    "updated_at": float(f["updated_at"]),
+                    "final_through": int(f["final_through"]) if "final_through" in f else None,
+                }
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def _bounds(dates: np.ndarray, start=None, end=None) -> tuple[int, int]:
+        """
+        Row range [lo, hi) of start <= date <= end, by binary search on the sorted date index.
+        """
+        lo = int(np.searchsorted(dates, _day(start), side="left")) if start is not None else 0
+        hi = int(np.searchsorted(dates, _day(end), side="right")) if end is not None else len(dates)
+        return lo, max(lo, hi)
+
+    def read(self, code: str, start=None, end=None, raw: Optional[dict] = None) -> Optional[pd.DataFrame]:
+        """
+        Stored bars with start <= date <= end (both inclusive, either may be None).
+
+        날짜 인덱스가 정렬되어 있으므로 이분 탐색으로 필요한 행만 잘라 DataFrame 을 만듭니다.
+        """
+        raw = raw if raw is not None else self.read_raw(code)
+        if raw is None:
+            return None
+        lo, hi = self._bounds(raw["dates"], start, end)
+        df = pd.DataFrame(raw["values"][lo:hi], index=_from_days(raw["dates"][lo:hi]), columns=raw["columns"])
+        # 정수형(Volume 등)은 원래 dtype 으로 복원
+        for col, dtype in zip(raw["columns"], raw["dtypes"]):
+            if dtype != "float64" and not df[col].isna().any():
+                df[col] = df[col].astype(dtype)
+        return df
+
+    def write(
+        self,
+        code: str,
+        df: pd.DataFrame,
+        covered_from: pd.Timestamp,
+        updated_at: Optional[float] = None,
+        final_through: Optional[pd.Timestamp] = None,
+    ) -> None:
+        """
+        Atomically replaces the stored frame for a code.
+
+        기본값은 '방금 오늘까지 받아왔음'(updated_at=지금, 어제까지 확정)입니다. 과거 구간만 받아온
+        경우에는 호출하는 쪽에서 이전 updated_at 과 확정일을 넘겨 is_fresh 가 속지 않게 합니다.
+        """
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        if final_through is None:
+            final_through = pd.Timestamp.today().normalize() - pd.Timedelta(days=1)
+        numeric = df.select_dtypes(include="number")
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f".{code}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    dates=_to_days(pd.DatetimeIndex(numeric.index)),
+                    values=numeric.to_numpy(dtype=np.float64),
+                    columns=np.array(numeric.columns, dtype=str),
+                    dtypes=np.array([str(d) for d in numeric.dtypes], dtype=str),
+                    covered_from=np.int64(_to_days(pd.DatetimeIndex([covered_from]))[0]),
+                    updated_at=np.float64(time.time() if updated_at is None else updated_at),
+                    final_through=np.int64(_day(final_through)),
+                )
+            os.replace(tmp, self._path(code))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def is_fresh(self, raw: Optional[dict], start: pd.Timestamp) -> bool:
+        if raw is None:
+            return False
+        if raw["covered_from"] > start:
+            return False
+        return (time.time() - raw["updated_at"]) < self.max_age
+
+    def covers(self, raw: Optional[dict], start: pd.Timestamp, end: pd.Timestamp) -> bool:
+        """
+        True if [start, end] is stored completely and will not change any more.
+
+        과거 구간은 end 까지 확정 봉으로 저장되어 있다면 원격 조회 없이 그대로 사용할 수 있습니다.
+        """
+        if raw is None or len(raw["dates"]) == 0 or raw["covered_from"] > start:
+            return False
+        return self.final_day(raw) >= _day(end)
+
+    @staticmethod
+    def final_day(raw: dict) -> int:
+        """
+        Epoch day through which the stored bars are complete (older files: derived from updated_at).
+        """
+        if raw.get("final_through") is not None:
+            return raw["final_through"]
+        # UTC 기준 날짜는 KST 보다 늦으므로 보수적으로(다시 받는 쪽으로) 판단됨
+        return int(np.datetime64(pd.Timestamp(raw["updated_at"], unit="s"), "D").astype(np.int64)) - 1
+
+    @contextmanager
+    def lock(self, code: str) -> Iterator[None]:
+        """
+        Exclusive per-code lock, held across processes (flock) and threads.
+        """
+        with self._guard:
+            tlock = self._thread_locks.setdefault(code, threading.Lock())
+        with tlock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.root / f".{code}.lock", "a") as lf:
+                fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+
+
+_default_store: Optional[OHLCVStore] = None
+
+
+def get_store() -> OHLCVStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = OHLCVStore()
+    return _default_store
@@ -0,0 +1,122 @@
+"""
+Server-push hub for live report updates.
+
+구독된 종목의 합집합을 한 번만 평가(LiveMonitor)하고, 종목별 요약이 바뀐 경우에만
+해당 종목을 구독 중인 모든 클라이언트 큐에 변경분(diff)을 넣습니다.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from src.live import LiveMonitor, NaverPriceSource, PriceSource
+
+# 대상가까지 남은 비율은 소수 4자리(0.01%)까지만 비교하여 의미 없는 변동은 보내지 않음
+_GAP_DIGITS = 4
+
+
+def summarize(result: dict[str, Any]) -> dict[str, Any]:
+    """
+    Flattens an evaluate_live() result into the fields clients care about.
+    """
+    summary: dict[str, Any] = {"price": result["price"]}
+    for group in ("caution", "warning", "overheating"):
+        summary[group] = result[group]["triggered"]
+        for name, rule in result[group]["rules"].items():
+            summary[f"{group}.{name}"] = rule["triggered"]
+            gap = rule.get("gap")
+            if gap is not None and not math.isnan(gap):
+                summary[f"{group}.{name}.gap"] = round(gap, _GAP_DIGITS)
+    return summary
+
+
+def diff(old: Optional[dict[str, Any]], new: dict[str, Any]) -> dict[str, Any]:
+    if old is None:
+        return dict(new)
+    changed = {k: v for k, v in new.items() if old.get(k) != v}
+    changed.update({k: None for k in old.keys() - new.keys()})
+    return changed
+
+
+class StreamHub:
+    """
+    One evaluation loop shared by every subscriber.
+
+    LiveMonitor 는 스레드 안전하지 않으므로 watch / unwatch / poll_once 는 모두
+    하나의 전용 스레드에서 제출 순서대로 실행합니다.
+    """
+
+    def __init__(self, source: Optional[PriceSource] = None, interval: float = 5.0, monitor: Optional[LiveMonitor] = None):
+        self.monitor = monitor or LiveMonitor(source or NaverPriceSource())
+        self.interval = interval
+        self.subscribers: dict[str, set[asyncio.Queue]] = {}
+        self.latest: dict[str, dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live-monitor")
+
+    def _run(self, fn, *args) -> asyncio.Future:
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def subscribe(self, codes: list[str]) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        new_codes = [c for c in codes if c not in self.subscribers]
+        for code in codes:
+            self.subscribers.setdefault(code, set()).add(queue)
+        if new_codes:
+            await self._run(self.monitor.watch, new_codes)
+            # watch 도중 구독이 모두 해제된 종목은 다시 감시 해제
+            stale = [c for c in new_codes if c not in self.subscribers]
+            if stale:
+                self._executor.submit(self.monitor.unwatch, stale)
+        # 이미 평가된 종목은 현재 상태를 바로 전송
+        for code in codes:
+            if code in self.latest:
+                queue.put_nowait({"code": code, "full": True, "changes": self.latest[code]})
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+        return queue
+
+    def unsubscribe(self, codes: list[str], queue: asyncio.Queue) -> None:
+        for code in codes:
+            queues = self.subscribers.get(code)
+            if queues is None:
+                continue
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[code]
+                self.latest.pop(code, None)
+                # 진행 중인 watch / poll 뒤에 실행되도록 같은 스레드에 제출
+                self._executor.submit(self.monitor.unwatch, [code])
+        if not self.subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def poll_once(self) -> None:
+        results = await self._run(self.monitor.poll_once)
+        for code, result in results.items():
+            queues = self.subscribers.get(code)
+            if not queues:
+                continue
+            summary = summarize(result)
+            changes = diff(self.latest.get(code), summary)
+            if not changes:
+                continue
+            message = {"code": code, "full": code not in self.latest, "changes": changes}
+            self.latest[code] = summary
+            for queue in list(queues):
+                if queue.full():
+                    # 느린 클라이언트는 가장 오래된 메시지를 버림
+                    queue.get_nowait()
+                queue.put_nowait(message)
+
+    async def _loop(self) -> None:
+        while self.subscribers:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in stream loop: {e}")
+            await asyncio.sleep(self.interval)
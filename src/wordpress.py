@@ -0,0 +1,349 @@
+"""
+WordPress REST API client.
+
+하나의 requests.Session(연결 풀, keep-alive)을 재사용하고 인증 헤더는 생성 시 한 번만 만듭니다.
+모든 요청에 제한 시간을 두고, 429 와 5xx 는 지수 백오프로 재시도합니다.
+(글 생성처럼 중복되면 안 되는 POST 는 429 일 때만 재시도 — 서버가 처리하지 않았음이 확실한 경우)
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import html
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.store import cache_dir
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+_IDEMPOTENT = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# 전체 태그/카테고리 목록을 다시 받는 주기 (다른 경로로 추가/삭제된 term 반영)
+_TERM_CACHE_TTL = float(os.getenv("WP_TERM_CACHE_TTL", str(7 * 86400)))
+TAXONOMIES = ("categories", "tags")
+
+
+class WordPressError(RuntimeError):
+    def __init__(self, message: str, response: Optional[requests.Response] = None):
+        super().__init__(message)
+        self.response = response
+
+
+def _term_key(name: str) -> str:
+    # WordPress 는 대소문자만 다른 이름을 같은 slug(같은 term)로 취급
+    return html.unescape(name).strip().casefold()
+
+
+class TermCache:
+    """
+    Persistent name -> term ID map per site (.cache/wordpress/terms-<site>.json).
+    """
+
+    def __init__(self, path: Path, ttl: float = _TERM_CACHE_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.terms: dict[str, dict[str, int]] = {t: {} for t in TAXONOMIES}
+        self.warmed_at = 0.0
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.terms.update({t: dict(v) for t, v in data.get("terms", {}).items()})
+            self.warmed_at = float(data.get("warmed_at", 0.0))
+        except (FileNotFoundError, ValueError):
+            pass
+
+    @classmethod
+    def for_site(cls, url: str) -> "TermCache":
+        site = hashlib.sha1(url.rstrip("/").encode()).hexdigest()[:12]
+        return cls(cache_dir("wordpress") / f"terms-{site}.json")
+
+    def is_warm(self) -> bool:
+        return time.time() - self.warmed_at < self.ttl
+
+    def get(self, taxonomy: str, name: str) -> Optional[int]:
+        return self.terms.get(taxonomy, {}).get(_term_key(name))
+
+    def update(self, taxonomy: str, ids: dict[str, int]) -> None:
+        if not ids:
+            return
+        with self._lock:
+            known = self.terms.setdefault(taxonomy, {})
+            changed = any(known.get(_term_key(n)) != i for n, i in ids.items())
+            known.update({_term_key(n): i for n, i in ids.items()})
+        if changed:
+            self.save()
+
+    def warm(self, client: "WordPressClient") -> None:
+        """
+        Replaces the cache with the full tag and category listings.
+        """
+        terms = {t: {_term_key(x["name"]): x["id"] for x in client.list_terms(t)} for t in TAXONOMIES}
+        with self._lock:
+            self.terms = terms
+            self.warmed_at = time.time()
+        self.save()
+
+    def expire(self) -> None:
+        """
+        Forces a full re-listing on next use (e.g. a cached ID was rejected because the term was deleted).
+        """
+        with self._lock:
+            self.warmed_at = 0.0
+        self.save()
+
+    def save(self) -> None:
+        with self._lock:
+            data = {"warmed_at": self.warmed_at, "terms": self.terms}
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+
+
+class WordPressClient:
+    def __init__(
+        self,
+        url: str,
+        username: str,
+        app_password: str,
+        timeout: tuple[float, float] = (5.0, 30.0),
+        retries: int = 3,
+        backoff: float = 0.5,
+        pool_size: int = 10,
+        term_cache: bool = True,
+    ):
+        self.base = url.rstrip("/") + "/wp-json"
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+        self.pool_size = pool_size
+        # 사이트별 name -> term ID 영구 캐시 (None 이면 사용 안 함)
+        self.term_cache: Optional[TermCache] = TermCache.for_site(url) if term_cache else None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        token = base64.b64encode(f"{username}:{app_password}".encode()).decode()
+        self.session.headers.update({"Authorization": f"Basic {token}", "Accept": "application/json"})
+
+    @classmethod
+    def from_env(cls) -> Optional["WordPressClient"]:
+        url, user, password = os.getenv("WP_URL"), os.getenv("WP_USERNAME"), os.getenv("WP_APP_PASSWORD")
+        if not url or not user or not password:
+            return None
+        return cls(url, user, password)
+
+    # --- transport ---------------------------------------------------------
+
+    def _sleep_for(self, attempt: int, response: Optional[requests.Response]) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), 60.0)
+        return self.backoff * (2 ** attempt)
+
+    def request(self, method: str, path: str, idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """
+        Sends a request to <WP_URL>/wp-json<path> with timeout and retry/backoff.
+
+        idempotent: 재시도해도 안전한 요청인지 (기본: HTTP 메서드로 판단).
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in _IDEMPOTENT
+        kwargs.setdefault("timeout", self.timeout)
+        url = path if path.startswith("http") else f"{self.base}{path}"
+
+        for attempt in range(self.retries + 1):
+            response = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # 연결 자체가 안 된 경우는 요청이 전달되지 않았으므로 항상 재시도 가능
+                if attempt >= self.retries or not (idempotent or isinstance(e, requests.ConnectTimeout)):
+                    raise WordPressError(f"{method} {path} failed: {e}") from e
+            else:
+                retryable = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUS)
+                if not retryable or attempt >= self.retries:
+                    return response
+            time.sleep(self._sleep_for(attempt, response))
+        raise AssertionError("unreachable")
+
+    def _json(self, method: str, path: str, **kwargs) -> Any:
+        response = self.request(method, path, **kwargs)
+        if not response.ok:
+            raise WordPressError(f"{method} {path} -> {response.status_code}: {response.text[:300]}", response)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise WordPressError(f"{method} {path} -> invalid JSON: {response.text[:300]}", response) from e
+
+    def batch(self, items: list[dict], idempotent: bool = False) -> list[dict]:
+        """
+        WordPress 5.6+ batch endpoint: 쓰기 요청 최대 25개를 한 번의 왕복으로 보냅니다.
+        items: [{"method": "POST", "path": "/wp/v2/tags", "body": {...}}, ...]
+        Returns the per-request responses ({"status": ..., "body": ...}).
+        """
+        out: list[dict] = []
+        for i in range(0, len(items), 25):
+            chunk = items[i:i + 25]
+            data = self._json("POST", "/batch/v1", json={"validation": "normal", "requests": chunk},
+                              idempotent=idempotent)
+            out.extend(data.get("responses", []))
+        return out
+
+    # --- terms -------------------------------------------------------------
+
+    def find_term(self, taxonomy: str, name: str) -> Optional[int]:
+        terms = self._json("GET", f"/wp/v2/{taxonomy}", params={"search": name, "per_page": 100})
+        for term in terms:
+            if html.unescape(term["name"]) == name:
+                return term["id"]
+        return None
+
+    def create_term(self, taxonomy: str, name: str) -> int:
+        # 이미 있는 term 을 만들면 400 term_exists 와 함께 기존 ID 가 오므로 재시도해도 안전
+        response = self.request("POST", f"/wp/v2/{taxonomy}", json={"name": name}, idempotent=True)
+        if response.ok:
+            return response.json()["id"]
+        existing = _term_exists_id(response)
+        if existing is not None:
+            return existing
+        raise WordPressError(f"create {taxonomy} {name!r} -> {response.status_code}: {response.text[:300]}", response)
+
+    def get_or_create_term(self, taxonomy: str, name: str) -> int:
+        term_id = self.find_term(taxonomy, name)
+        return term_id if term_id is not None else self.create_term(taxonomy, name)
+
+    def create_terms(self, taxonomy: str, names: list[str]) -> dict[str, int]:
+        """
+        Creates several terms in one batch request (falls back to one request each
+        when the batch endpoint is unavailable). Returns name -> ID for the ones that succeeded.
+        """
+        if len(names) <= 1:
+            return {name: self.create_term(taxonomy, name) for name in names}
+        try:
+            responses = self.batch(
+                [{"method": "POST", "path": f"/wp/v2/{taxonomy}", "body": {"name": n}} for n in names],
+                idempotent=True,
+            )
+        except WordPressError as e:
+            if e.response is None or e.response.status_code not in (404, 405):
+                raise
+            return {name: self.create_term(taxonomy, name) for name in names}
+
+        ids = {}
+        for name, res in zip(names, responses):
+            body = res.get("body") or {}
+            if isinstance(body, dict) and "id" in body:
+                ids[name] = body["id"]
+            elif isinstance(body, dict) and body.get("code") == "term_exists":
+                ids[name] = int((body.get("data") or {}).get("term_id"))
+        return ids
+
+    def get_or_create_category(self, name: str) -> Optional[int]:
+        return self.resolve_terms("categories", [name]).get(name.strip())
+
+    def get_or_create_tag(self, name: str) -> Optional[int]:
+        return self.resolve_terms("tags", [name]).get(name.strip())
+
+    def _terms_page(self, taxonomy: str, page: int, per_page: int) -> requests.Response:
+        response = self.request("GET", f"/wp/v2/{taxonomy}", params={
+            "per_page": per_page, "page": page, "_fields": "id,name", "hide_empty": "false",
+        })
+        if not response.ok:
+            raise WordPressError(f"list {taxonomy} -> {response.status_code}", response)
+        return response
+
+    def list_terms(self, taxonomy: str, per_page: int = 100) -> list[dict]:
+        """
+        Every term of a taxonomy. 첫 페이지에서 X-WP-TotalPages 를 확인한 뒤 나머지 페이지는 동시에 받습니다.
+        """
+        first = self._terms_page(taxonomy, 1, per_page)
+        pages = int(first.headers.get("X-WP-TotalPages", 1))
+        terms = list(first.json())
+        if pages > 1:
+            with ThreadPoolExecutor(max_workers=min(self.pool_size, pages - 1)) as pool:
+                for response in pool.map(lambda p: self._terms_page(taxonomy, p, per_page), range(2, pages + 1)):
+                    terms.extend(response.json())
+        return terms
+
+    def resolve_terms(self, taxonomy: str, names: Iterable[str]) -> dict[str, int]:
+        """
+        name -> term ID using the persistent TermCache.
+
+        - 캐시에 있으면 네트워크 없이 반환
+        - 캐시가 전체 목록으로 채워져 있으면(warm) 없는 이름은 새 term 이므로 바로 batch 생성 (왕복 1회)
+        - 그렇지 않으면 없는 이름을 동시에 검색한 뒤, 그래도 없는 것만 batch 생성
+        """
+        names = list(dict.fromkeys(n.strip() for n in names if n and n.strip()))
+        cache = self.term_cache
+        if cache is not None and not cache.is_warm():
+            try:
+                cache.warm(self)
+            except WordPressError as e:
+                print(f"Error warming term cache: {e}")
+
+        ids: dict[str, int] = {}
+        missing = []
+        for name in names:
+            term_id = cache.get(taxonomy, name) if cache is not None else None
+            if term_id is None:
+                missing.append(name)
+            else:
+                ids[name] = term_id
+
+        if missing and not (cache is not None and cache.is_warm()):
+            with ThreadPoolExecutor(max_workers=min(self.pool_size, len(missing))) as pool:
+                found = dict(zip(missing, pool.map(lambda n: self.find_term(taxonomy, n), missing)))
+            ids.update({n: t for n, t in found.items() if t is not None})
+            missing = [n for n in missing if found[n] is None]
+        if missing:
+            ids.update(self.create_terms(taxonomy, missing))
+
+        if cache is not None:
+            cache.update(taxonomy, ids)
+        return ids
+
+    # --- posts -------------------------------------------------------------
+
+    def create_post(self, data: dict) -> dict:
+        # 재시도하지 않음: 타임아웃/5xx 라도 서버에서는 이미 글이 만들어졌을 수 있음 (find_post 로 확인)
+        return self._json("POST", "/wp/v2/posts", json=data)
+
+    def find_post(self, title: str) -> Optional[dict]:
+        """
+        Published post with exactly this title, if any ({"id", "link", "title"}).
+        """
+        posts = self._json("GET", "/wp/v2/posts", params={"search": title, "per_page": 20, "_fields": "id,link,title"})
+        for post in posts:
+            rendered = (post.get("title") or {}).get("rendered", "")
+            if html.unescape(rendered) == title:
+                return post
+        return None
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def _term_exists_id(response: requests.Response) -> Optional[int]:
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    if isinstance(body, dict) and body.get("code") == "term_exists":
+        data = body.get("data") or {}
+        term_id = data.get("term_id") if isinstance(data, dict) else None
+        return int(term_id) if term_id is not None else None
+    return None
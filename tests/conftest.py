@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# src 모듈이 import 시점에 캐시 경로를 읽으므로 테스트용 임시 디렉터리로 먼저 돌려 둠
+os.environ.setdefault("STOCK_CACHE_DIR", tempfile.mkdtemp(prefix="stock-test-"))
+os.environ.setdefault("STOCK_PROVIDERS", "local")
+os.environ.setdefault("STOCK_NAME_PROVIDERS", "local")
+os.environ.setdefault("STOCK_SNAPSHOT", "0")
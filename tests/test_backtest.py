@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import backtest
+
+
+def _brute_force(signals, events, horizon):
+    n = len(signals)
+    events = sorted({e for e in events if 0 <= e < n})
+    sig = [t for t in range(n) if signals[t]]
+    hits = sum(any(t < e <= t + horizon for e in events) for t in sig)
+    detected, leads = 0, []
+    for e in events:
+        window = [t for t in sig if e - horizon <= t < e]
+        if window:
+            detected += 1
+            leads.append(e - window[0])
+    return hits, len(events), detected, leads
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_match_signals_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n, horizon = 200, int(rng.integers(1, 10))
+    signals = rng.random(n) < 0.1
+    events = rng.integers(-20, n + 20, 15)
+
+    result = backtest.match_signals(signals, events, horizon)
+
+    hits, n_events, detected, leads = _brute_force(signals, events, horizon)
+    assert result["signals"] == int(signals.sum())
+    assert result["true_positives"] == hits
+    assert result["events"] == n_events
+    assert result["detected"] == detected
+    assert result["leads"] == leads
+
+
+def _frame(start, end):
+    index = pd.bdate_range(start, end, name="Date")
+    close = np.linspace(10_000, 12_000, len(index))
+    return pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": 100_000},
+        index=index,
+    )
+
+
+@pytest.fixture
+def loader():
+    calls = []
+
+    def load(code, days, end):
+        calls.append((code, days, end))
+        return _frame(end - pd.Timedelta(days=days), end)
+
+    load.calls = calls
+    return load
+
+
+def test_backtest_code_ignores_events_outside_window(loader):
+    events = pd.DataFrame({
+        "code": "000001",
+        "date": pd.to_datetime(["2023-06-01", "2024-03-11", "2024-05-02"]),
+        "type": "caution",
+    })
+
+    result = backtest.backtest_code("000001", events, "2024-03-01", "2024-03-29", loader=loader)
+
+    assert result["caution"]["events"] == 1
+    assert result["warning"]["events"] == 0
+    assert result["bars"] == len(pd.bdate_range("2024-03-01", "2024-03-29"))
+    code, days, end = loader.calls[0]
+    assert end == pd.Timestamp("2024-03-29") and days >= 28
+
+
+def test_backtest_code_moves_holiday_event_to_next_bar(loader, monkeypatch):
+    # 2024-03-02 는 토요일 → 다음 거래일(03-04) 봉으로 매칭, 그 전날 신호가 있으면 선행 1봉
+    def history(df):
+        flags = pd.DataFrame(False, index=df.index, columns=list(backtest.KINDS))
+        flags.loc["2024-03-01", "warning"] = True
+        return flags
+
+    monkeypatch.setattr(backtest, "evaluate_history", history)
+    events = pd.DataFrame({"code": "000001", "date": [pd.Timestamp("2024-03-02")], "type": "warning"})
+
+    result = backtest.backtest_code("000001", events, "2024-03-01", "2024-03-29", loader=loader)
+
+    assert result["warning"] == {"signals": 1, "true_positives": 1, "events": 1, "detected": 1, "leads": [1]}
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import data_fetcher
+from src.store import OHLCVStore
+
+TODAY = pd.Timestamp(datetime.today().date())
+
+
+class FakeRemote:
+    """Deterministic daily bars for any [start, end] window, recording each call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, code, start, end):
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        self.calls.append((start, end))
+        index = pd.bdate_range(start, end, name="Date")
+        close = (index.values.astype("datetime64[D]").astype(np.int64) % 1000 + 1000).astype(float)
+        return pd.DataFrame(
+            {"Open": close, "High": close + 10, "Low": close - 10, "Close": close, "Volume": 1_000},
+            index=index,
+        )
+
+
+@pytest.fixture
+def remote(tmp_path, monkeypatch):
+    store = OHLCVStore(tmp_path, max_age=3600)
+    fake = FakeRemote()
+    monkeypatch.setattr(data_fetcher, "get_store", lambda: store)
+    monkeypatch.setattr(data_fetcher, "_fetch_ohlcv", fake)
+    fake.store = store
+    return fake
+
+
+def test_recent_window_is_served_from_store_while_fresh(remote):
+    first = data_fetcher.get_stock_data("000001", days=120)
+    second = data_fetcher.get_stock_data("000001", days=120)
+
+    assert len(remote.calls) == 1
+    assert remote.calls[0] == (TODAY - timedelta(days=120), TODAY)
+    pd.testing.assert_frame_equal(first, second, check_freq=False)
+
+
+def test_historical_window_inside_stored_range_needs_no_fetch(remote):
+    data_fetcher.get_stock_data("000001", days=365)
+    end = TODAY - timedelta(days=60)
+
+    df = data_fetcher.get_stock_data("000001", days=120, end=end)
+
+    assert len(remote.calls) == 1
+    assert df.index[-1] <= end and df.index[0] >= end - timedelta(days=120)
+    expected = remote("000001", end - timedelta(days=120), end)
+    pd.testing.assert_frame_equal(df, expected, check_freq=False, check_dtype=False, check_index_type=False)
+
+
+def test_partially_covered_window_fetches_only_the_missing_head(remote):
+    data_fetcher.get_stock_data("000001", days=120)
+    stored_first = remote.store.read("000001").index[0]
+
+    df = data_fetcher.get_stock_data("000001", days=200)
+
+    start = TODAY - timedelta(days=200)
+    assert remote.calls[1] == (start, stored_first - timedelta(days=1))
+    assert len(remote.calls) == 2
+    assert df.index[0] >= start and df.index.is_monotonic_increasing and df.index.is_unique
+    assert remote.store.read_raw("000001")["covered_from"] == start
+
+
+def test_historical_window_before_stored_range_fetches_only_that_window(remote):
+    data_fetcher.get_stock_data("000001", days=120)
+    before = remote.store.read_raw("000001")
+    end = TODAY - timedelta(days=730)
+
+    df = data_fetcher.get_stock_data("000001", days=120, end=end)
+
+    assert remote.calls[1] == (end - timedelta(days=120), end)
+    assert df.index[-1] <= end
+    after = remote.store.read_raw("000001")
+    assert after["covered_from"] == before["covered_from"]
+    assert after["updated_at"] == before["updated_at"]
+
+
+def test_historical_write_does_not_make_recent_window_fresh(remote):
+    end = TODAY - timedelta(days=30)
+    data_fetcher.get_stock_data("000001", days=120, end=end)
+    assert remote.calls == [(end - timedelta(days=120), end)]
+
+    data_fetcher.get_stock_data("000001", days=120)
+
+    # 오늘 기준 요청은 저장된 마지막 봉부터 다시 받아야 함
+    assert len(remote.calls) == 2
+    assert remote.calls[1][1] == TODAY
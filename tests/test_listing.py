@@ -0,0 +1,43 @@
+import pytest
+
+from src import listing
+from src.listing import ListingEntry, ListingIndex
+
+
+@pytest.fixture
+def stale_listing(monkeypatch):
+    # 어제자 목록만 디스크에 있고 오늘 다운로드는 실패하는 상황
+    entries = {f"{i:06d}": ListingEntry(f"{i:06d}", f"name-{i}", "KOSPI", 1000) for i in range(2700)}
+    monkeypatch.setattr(listing, "_index", None)
+    monkeypatch.setattr(listing, "_last_attempt", 0.0)
+    listing._persist(ListingIndex(entries, "2000-01-01"))
+
+    calls = {"read": 0, "download": 0}
+    read = listing._read_persisted
+
+    def counting_read():
+        calls["read"] += 1
+        return read()
+
+    def failing_download():
+        calls["download"] += 1
+        return None
+
+    monkeypatch.setattr(listing, "_read_persisted", counting_read)
+    monkeypatch.setattr(listing, "_download_listing", failing_download)
+    yield calls
+    listing._listing_path().unlink(missing_ok=True)
+
+
+def test_stale_index_is_kept_in_memory_while_retry_waits(stale_listing):
+    for i in range(200):
+        entry = listing.get_listing_entry(f"{i:06d}")
+        assert entry is not None and entry.name == f"name-{i}"
+    assert stale_listing == {"read": 1, "download": 1}
+
+
+def test_download_is_retried_after_interval(stale_listing, monkeypatch):
+    listing.get_listing_entry("000001")
+    monkeypatch.setattr(listing, "_last_attempt", listing._last_attempt - listing._RETRY_INTERVAL - 1)
+    assert listing.get_listing_entry("000002").name == "name-2"
+    assert stale_listing == {"read": 1, "download": 2}
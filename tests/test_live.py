@@ -0,0 +1,87 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.checkers import caution as ca
+from src.live import LiveBases, LiveMonitor, Quote, StaticPriceSource, evaluate_live
+
+CODE = "005930"
+
+
+@pytest.fixture
+def frame():
+    # 2026-10-16(금)까지 60 거래일
+    index = pd.bdate_range(end="2026-10-16", periods=60, name="Date")
+    rng = np.random.default_rng(0)
+    close = 10000 * np.cumprod(1 + rng.normal(0, 0.03, len(index)))
+    return pd.DataFrame({
+        "Open": close, "High": close * 1.02, "Low": close * 0.98, "Close": close,
+        "Volume": rng.integers(100_000, 1_000_000, len(index)).astype(float),
+    }, index=index)
+
+
+def bar_quote(df, day):
+    row = df.loc[pd.Timestamp(day)]
+    return Quote(price=row["Close"], volume=row["Volume"], high=row["High"], low=row["Low"], date=day)
+
+
+def test_weekend_quote_is_evaluated_against_the_previous_session(frame):
+    # 토요일: 시세는 금요일 종가, 일봉도 금요일까지 있음
+    friday = date(2026, 10, 16)
+    source = StaticPriceSource({CODE: bar_quote(frame, friday)})
+    monitor = LiveMonitor(source, loader=lambda code: frame)
+    monitor.watch([CODE], as_of=date(2026, 10, 17))
+
+    results = monitor.poll_once()
+
+    bases = monitor.bases[CODE]
+    assert bases.base_date == pd.Timestamp("2026-10-15")
+    assert bases.prev_close == frame["Close"].iloc[-2]
+    # 금요일 봉을 한 번만 반영한 결과 (금요일 종가를 '오늘 봉'으로 중복해 붙이지 않음)
+    expected = evaluate_live(LiveBases.from_frame(CODE, frame.iloc[:-1]), bar_quote(frame, friday))
+    assert results[CODE] == expected
+    target = results[CODE]["caution"]["rules"]["종가급변종목"]["target_price"]
+    assert target == pytest.approx(frame["Close"].iloc[-2] * (1 + ca.THRESH_CLOSE_CHANGE))
+
+
+def test_intraday_bar_from_loader_is_replaced_by_quote(frame):
+    monday = date(2026, 10, 19)
+    intraday = frame.iloc[[-1]].set_axis(pd.DatetimeIndex([pd.Timestamp(monday)], name="Date"))
+    with_intraday = pd.concat([frame, intraday])
+    quote = Quote(price=frame["Close"].iloc[-1] * 1.1, volume=500_000.0, date=monday)
+    monitor = LiveMonitor(StaticPriceSource({CODE: quote}), loader=lambda code: with_intraday)
+    monitor.watch([CODE], as_of=monday)
+
+    results = monitor.poll_once()
+
+    assert monitor.bases[CODE].base_date == pd.Timestamp("2026-10-16")
+    assert results[CODE] == evaluate_live(LiveBases.from_frame(CODE, frame), quote)
+
+
+def test_quote_not_newer_than_bases_is_skipped(frame):
+    loader = {"df": frame}
+    source = StaticPriceSource({CODE: bar_quote(frame, date(2026, 10, 16))})
+    monitor = LiveMonitor(source, loader=lambda code: loader["df"])
+    monitor.watch([CODE], as_of=date(2026, 10, 19))
+    assert monitor.bases[CODE].base_date == pd.Timestamp("2026-10-16")
+
+    # 기준값을 다시 만들 수 없으면 이미 완료 봉에 포함된 시세는 평가하지 않음
+    loader["df"] = None
+    assert monitor.poll_once() == {}
+
+
+def test_next_session_quote_rebases(frame):
+    friday, monday = date(2026, 10, 16), date(2026, 10, 19)
+    source = StaticPriceSource({CODE: bar_quote(frame, friday)})
+    monitor = LiveMonitor(source, loader=lambda code: frame)
+    monitor.watch([CODE], as_of=date(2026, 10, 18))
+    monitor.poll_once()
+    assert monitor.bases[CODE].base_date == pd.Timestamp("2026-10-15")
+
+    source.set(CODE, Quote(price=frame["Close"].iloc[-1], volume=1.0, date=monday))
+    results = monitor.poll_once()
+    assert monitor.bases[CODE].base_date == pd.Timestamp("2026-10-16")
+    assert results[CODE]["caution"]["rules"]["종가급변종목"]["target_price"] == pytest.approx(
+        frame["Close"].iloc[-1] * (1 + ca.THRESH_CLOSE_CHANGE))
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import market
+
+KST = market.MARKETS["KR"][0]
+
+
+@pytest.fixture
+def frame():
+    index = pd.bdate_range(end="2026-10-16", periods=6, name="Date")
+    columns = pd.MultiIndex.from_product([["Open", "High", "Low", "Close", "Adj Close", "Volume"], list(market.INDICES)])
+    return pd.DataFrame(np.arange(6 * 30, dtype=float).reshape(6, 30) + 100, index=index, columns=columns)
+
+
+def test_intraday_bar_is_not_reported_as_close(frame):
+    # 10-16(금) 11:00 KST: 한국은 장중, 미국은 10-15 종가까지만 확정
+    snapshot = market.compute_snapshot(frame, datetime(2026, 10, 16, 11, 0, tzinfo=KST))
+    assert {v["date"] for v in snapshot.values()} == {"2026-10-15"}
+
+    snapshot = market.compute_snapshot(frame, datetime(2026, 10, 17, 9, 0, tzinfo=KST))
+    assert {v["date"] for v in snapshot.values()} == {"2026-10-16"}
+
+
+def test_each_index_uses_its_own_previous_bar(frame):
+    frame.loc["2026-10-16", ("Close", "^KS11")] = np.nan  # 한국만 휴장
+    frame.loc["2026-10-14", ("Close", "^KS11")] = np.nan
+
+    snapshot = market.compute_snapshot(frame, datetime(2026, 10, 17, 9, 0, tzinfo=KST))
+
+    kospi = frame[("Close", "^KS11")].dropna()
+    assert snapshot["^KS11"]["date"] == "2026-10-15"
+    assert snapshot["^KS11"]["change"] == round(kospi.iloc[-1] - kospi.iloc[-2], 2)
+    assert snapshot["^IXIC"]["date"] == "2026-10-16"
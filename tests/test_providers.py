@@ -0,0 +1,64 @@
+import threading
+import time
+
+from src.providers import CircuitBreaker, ProviderChain
+
+
+class HangingProvider:
+    """get_name 이 release 될 때까지 멈춰 있는 공급원 (응답 없는 외부 서버 흉내)."""
+
+    name = "hanging"
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def get_name(self, code):
+        if not self.release.wait(5):
+            raise TimeoutError("never released")
+        return f"name-{code}"
+
+
+def test_breaker_half_open_allows_one_trial():
+    breaker = CircuitBreaker(threshold=2, cooldown=0.05)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()  # 시험 호출은 하나만
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_busy_provider_does_not_leave_breaker_stuck_open():
+    provider = HangingProvider()
+    chain = ProviderChain(ohlcv=[provider], names=[provider], timeouts={"hanging": 0.05},
+                          threshold=1, cooldown=0.2, max_inflight=1)
+    breaker = chain.breakers["hanging"]
+
+    # 1) 응답이 없어 제한 시간 초과 → open (멈춘 호출이 자리를 계속 차지)
+    assert chain.get_name("005930") is None
+    assert breaker.state == "open"
+    assert chain.get_name("005930") is None
+
+    # 2) cooldown 이 지나 half-open 이지만 자리가 없어 건너뜀 → 시험 호출을 소모하지 않아야 함
+    time.sleep(0.25)
+    assert chain.get_name("005930") is None
+    assert breaker.state == "half-open"
+    assert not breaker._trial
+
+    # 3) 공급원이 회복되면 다음 호출이 시험 호출로 성공하고 닫힘
+    provider.release.set()
+    deadline = time.monotonic() + 2
+    while chain._slot("hanging", "get_name")._value == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert chain.get_name("005930") == "name-005930"
+    assert breaker.state == "closed"
@@ -0,0 +1,40 @@
+import argparse
+from datetime import datetime
+from tabulate import tabulate
+from src.live import LiveMonitor, NaverPriceSource
+
+
+def main():
+    parser = argparse.ArgumentParser(description="장중 현재가 기준 지정 요건 실시간 감시")
+    parser.add_argument("codes", nargs="+", help="감시할 종목코드")
+    parser.add_argument("--interval", type=float, default=5.0, help="조회 주기(초)")
+    args = parser.parse_args()
+
+    monitor = LiveMonitor(NaverPriceSource())
+    print(f"{len(args.codes)}개 종목 기준값 계산 중...")
+    monitor.watch(args.codes)
+
+    def show(results):
+        rows = []
+        for code, r in results.items():
+            targets = [v for grp in ("caution", "warning") for v in r[grp]["rules"].values() if v["gap"] is not None and v["gap"] > 0]
+            nearest = min(targets, key=lambda v: v["gap"]) if targets else None
+            rows.append([
+                code,
+                f"{r['price']:,.0f}",
+                "O" if r["warning"]["triggered"] else "",
+                "O" if r["caution"]["triggered"] else "",
+                "O" if r["overheating"]["triggered"] else "",
+                f"{nearest['target_price']:,.0f} (+{nearest['gap']:.2%})" if nearest else "-",
+            ])
+        print(f"\n[{datetime.now():%H:%M:%S}]")
+        print(tabulate(rows, headers=["종목", "현재가", "경고", "주의", "과열", "가장 가까운 대상가"]))
+
+    try:
+        monitor.run(args.interval, show)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()